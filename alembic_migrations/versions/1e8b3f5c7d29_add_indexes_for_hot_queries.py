@@ -0,0 +1,54 @@
+"""add indexes for hot queries
+
+Revision ID: 1e8b3f5c7d29
+Revises: c7d2e81f4a05
+Create Date: 2026-10-18 14:31:06.518442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e8b3f5c7d29'
+down_revision: Union[str, None] = 'c7d2e81f4a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# subscribe.follower_id is already covered by unique_follower_followed (follower_id, followed_id),
+# token_blacklist_outstanding.exp by ix_token_blacklist_outstanding_exp (c7d2e81f4a05).
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_subscribe_followed_id'),
+            'subscribe',
+            ['followed_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            op.f('ix_notification_notification_time'),
+            'notification',
+            ['notification_time'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_notification_notification_time'),
+            table_name='notification',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            op.f('ix_subscribe_followed_id'),
+            table_name='subscribe',
+            postgresql_concurrently=True
+        )
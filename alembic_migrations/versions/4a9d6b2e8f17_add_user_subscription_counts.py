@@ -0,0 +1,45 @@
+"""add user subscription counts
+
+Revision ID: 4a9d6b2e8f17
+Revises: 1e8b3f5c7d29
+Create Date: 2026-10-18 15:02:44.270391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d6b2e8f17'
+down_revision: Union[str, None] = '1e8b3f5c7d29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('followers_count', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('user', sa.Column('following_count', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.execute(
+        """
+        UPDATE "user"
+        SET followers_count = counts.total
+        FROM (SELECT followed_id, count(*) AS total FROM subscribe GROUP BY followed_id) AS counts
+        WHERE "user".id = counts.followed_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE "user"
+        SET following_count = counts.total
+        FROM (SELECT follower_id, count(*) AS total FROM subscribe GROUP BY follower_id) AS counts
+        WHERE "user".id = counts.follower_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'following_count')
+    op.drop_column('user', 'followers_count')
@@ -0,0 +1,50 @@
+"""add token revocation indexes
+
+Revision ID: 5b1e7c2d9a40
+Revises: e2823f3ac0a5
+Create Date: 2026-10-18 10:02:11.412907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = 'e2823f3ac0a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_token_blacklist_outstanding_jti'),
+            'token_blacklist_outstanding',
+            ['jti'],
+            unique=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            op.f('ix_token_blacklisted_blacklisted_at'),
+            'token_blacklisted',
+            ['blacklisted_at'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_token_blacklisted_blacklisted_at'),
+            table_name='token_blacklisted',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            op.f('ix_token_blacklist_outstanding_jti'),
+            table_name='token_blacklist_outstanding',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,54 @@
+"""lease email outbox rows
+
+Revision ID: a7c9e1b3d5f6
+Revises: f2a4c6e8b0d3
+Create Date: 2026-10-18 21:04:37.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f6'
+down_revision: Union[str, None] = 'f2a4c6e8b0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_email_outbox_due_next_attempt_at',
+            'email_outbox',
+            ['next_attempt_at'],
+            unique=False,
+            postgresql_where=sa.text("status IN ('pending', 'sending')"),
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_email_outbox_pending_next_attempt_at',
+            table_name='email_outbox',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE email_outbox SET status = 'pending' WHERE status = 'sending'")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_email_outbox_pending_next_attempt_at',
+            'email_outbox',
+            ['next_attempt_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_email_outbox_due_next_attempt_at',
+            table_name='email_outbox',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,57 @@
+"""add user birthday_month_day
+
+Revision ID: b3e5a7c9d1f2
+Revises: 4a9d6b2e8f17
+Create Date: 2026-10-18 15:48:12.604917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e5a7c9d1f2'
+down_revision: Union[str, None] = '4a9d6b2e8f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Adding a stored generated column rewrites "user" under an ACCESS EXCLUSIVE lock,
+# the index is then built concurrently.
+
+
+def upgrade() -> None:
+    op.add_column(
+        'user',
+        sa.Column(
+            'birthday_month_day',
+            sa.SmallInteger(),
+            sa.Computed(
+                "(EXTRACT(MONTH FROM birthday) * 100 + EXTRACT(DAY FROM birthday))::smallint",
+                persisted=True
+            ),
+            nullable=False
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_user_birthday_month_day'),
+            'user',
+            ['birthday_month_day'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_user_birthday_month_day'),
+            table_name='user',
+            postgresql_concurrently=True
+        )
+
+    op.drop_column('user', 'birthday_month_day')
@@ -0,0 +1,38 @@
+"""add index on token_blacklist_outstanding exp
+
+Revision ID: c7d2e81f4a05
+Revises: 9c4f0a6e3b12
+Create Date: 2026-10-18 12:08:54.220631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e81f4a05'
+down_revision: Union[str, None] = '9c4f0a6e3b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_token_blacklist_outstanding_exp'),
+            'token_blacklist_outstanding',
+            ['exp'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_token_blacklist_outstanding_exp'),
+            table_name='token_blacklist_outstanding',
+            postgresql_concurrently=True
+        )
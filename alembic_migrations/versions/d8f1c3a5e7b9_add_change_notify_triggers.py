@@ -0,0 +1,114 @@
+"""add change notify triggers
+
+Revision ID: d8f1c3a5e7b9
+Revises: b3e5a7c9d1f2
+Create Date: 2026-10-18 16:37:25.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f1c3a5e7b9'
+down_revision: Union[str, None] = 'b3e5a7c9d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers with transition tables: one NOTIFY per changed row,
+# or a single {"op": "resync"} when a statement touches more than 1000 rows (imports, batch updates).
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION notify_notification_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                IF (SELECT count(*) FROM old_rows) > 1000 THEN
+                    PERFORM pg_notify('notification_changes', json_build_object('op', 'resync')::text);
+                ELSE
+                    PERFORM pg_notify(
+                        'notification_changes',
+                        json_build_object('op', TG_OP, 'id', id, 'notification_time', notification_time)::text
+                    ) FROM old_rows;
+                END IF;
+            ELSE
+                IF (SELECT count(*) FROM new_rows) > 1000 THEN
+                    PERFORM pg_notify('notification_changes', json_build_object('op', 'resync')::text);
+                ELSE
+                    PERFORM pg_notify(
+                        'notification_changes',
+                        json_build_object('op', TG_OP, 'id', id, 'notification_time', notification_time)::text
+                    ) FROM new_rows;
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION notify_subscription_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                IF (SELECT count(*) FROM old_rows) > 1000 THEN
+                    PERFORM pg_notify('subscription_changes', json_build_object('op', 'resync')::text);
+                ELSE
+                    PERFORM pg_notify(
+                        'subscription_changes',
+                        json_build_object('op', TG_OP, 'follower_id', follower_id, 'followed_id', followed_id)::text
+                    ) FROM old_rows;
+                END IF;
+            ELSE
+                IF (SELECT count(*) FROM new_rows) > 1000 THEN
+                    PERFORM pg_notify('subscription_changes', json_build_object('op', 'resync')::text);
+                ELSE
+                    PERFORM pg_notify(
+                        'subscription_changes',
+                        json_build_object('op', TG_OP, 'follower_id', follower_id, 'followed_id', followed_id)::text
+                    ) FROM new_rows;
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    op.execute(
+        "CREATE TRIGGER notification_inserted AFTER INSERT ON notification "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_notification_changes()"
+    )
+    op.execute(
+        "CREATE TRIGGER notification_updated AFTER UPDATE ON notification "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_notification_changes()"
+    )
+    op.execute(
+        "CREATE TRIGGER notification_deleted AFTER DELETE ON notification "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_notification_changes()"
+    )
+    op.execute(
+        "CREATE TRIGGER subscribe_inserted AFTER INSERT ON subscribe "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_subscription_changes()"
+    )
+    op.execute(
+        "CREATE TRIGGER subscribe_deleted AFTER DELETE ON subscribe "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_subscription_changes()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER subscribe_deleted ON subscribe")
+    op.execute("DROP TRIGGER subscribe_inserted ON subscribe")
+    op.execute("DROP TRIGGER notification_deleted ON notification")
+    op.execute("DROP TRIGGER notification_updated ON notification")
+    op.execute("DROP TRIGGER notification_inserted ON notification")
+    op.execute("DROP FUNCTION notify_subscription_changes()")
+    op.execute("DROP FUNCTION notify_notification_changes()")
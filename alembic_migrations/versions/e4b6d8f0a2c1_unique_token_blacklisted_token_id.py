@@ -0,0 +1,44 @@
+"""unique token_blacklisted token_id
+
+Revision ID: e4b6d8f0a2c1
+Revises: a7c9e1b3d5f6
+Create Date: 2026-10-18 23:12:48.503317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b6d8f0a2c1'
+down_revision: Union[str, None] = 'a7c9e1b3d5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM token_blacklisted AS duplicate "
+        "USING token_blacklisted AS kept "
+        "WHERE duplicate.token_id = kept.token_id AND duplicate.id > kept.id"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_token_blacklisted_token_id'),
+            'token_blacklisted',
+            ['token_id'],
+            unique=True,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_token_blacklisted_token_id'),
+            table_name='token_blacklisted',
+            postgresql_concurrently=True
+        )
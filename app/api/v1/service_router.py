@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends
+
+from app.constants.service_constants import SERVICE_API_PREFIX
+from app.core.cache import principal_cache
+from app.core.hashing import password_hasher
+from app.core.revocation import revoked_tokens
+from app.core.security import verify_metrics_token
+from app.core.smtp_pool import smtp_pool
+from app.services.notification_scheduler import notification_scheduler
+from app.services.email_outbox import email_outbox_sender
+from database.core import pool_stats
+from database.token_ledger import refresh_token_ledger
+from database.listener import database_listener
+from database.replica import replica_router
+
+
+router = APIRouter(prefix=SERVICE_API_PREFIX)
+
+
+@router.get(
+    "/metrics",
+    tags=["Service"],
+    description="Внутренние метрики сервиса.",
+    dependencies=[Depends(verify_metrics_token)],
+    include_in_schema=False
+)
+async def read_metrics() -> dict:
+
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "revoked_tokens": revoked_tokens.stats(),
+        "refresh_token_ledger": refresh_token_ledger.stats(),
+        "notification_scheduler": notification_scheduler.stats(),
+        "email_outbox": email_outbox_sender.stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "database_listener": database_listener.stats(),
+        "db_pool": pool_stats(),
+        "db_replica": replica_router.stats(),
+    }
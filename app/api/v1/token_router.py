@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Response, Cookie, Depends
+from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.token_constants import TOKEN_API_PREFIX, TOKEN_REFRESH_BAD_RESPONSES
+from app.core.security import read_refresh_token_payload, revoke_refresh_token
+from app.services.user_services import create_tokens
+from app.schemas.token_schemas import AccessTokenSchema
+from database.core import get_db_session
+
+
+router = APIRouter(prefix=TOKEN_API_PREFIX)
+
+
+@router.post(
+    "/refresh",
+    response_model=AccessTokenSchema,
+    responses=TOKEN_REFRESH_BAD_RESPONSES,
+    tags=["Token"],
+    description="Обновление пары токенов по рефреш-токену из куки (старый рефреш отзывается)."
+)
+async def refresh_tokens(
+        response: Response,
+        session: Annotated[AsyncSession, Depends(get_db_session)],
+        refresh_token: Annotated[str | None, Cookie()] = None
+) -> AccessTokenSchema:
+
+    payload = await read_refresh_token_payload(token=refresh_token)
+
+    await revoke_refresh_token(session=session, payload=payload)
+
+    access_token, refresh_token = await create_tokens(session=session, user_id=int(payload.get("sub")))
+
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=True,
+        samesite="none"
+    )
+
+    return AccessTokenSchema(
+        access_token=access_token,
+        token_type="bearer"
+    )
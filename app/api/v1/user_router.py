@@ -1,32 +1,58 @@
-from fastapi import APIRouter, Response, Form, Depends, Path, Body
+from fastapi import APIRouter, Request, Response, Form, Depends, Path, Body, Cookie, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import Annotated
+from typing import Annotated, Literal
 from pydantic import EmailStr
 from email_validator import validate_email
-from datetime import date, timedelta
+from datetime import date, time, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants.user_constants import USER_API_PREFIX
+from app.exceptions.token_exceptions import TokenRevoked
 from app.exceptions.user_exceptions import (
     PasswordsDoNotMatch, TooLongUsername, InvalidEmailDomain,
     UserExistError, SubscriptionError, NotificationTimeTooLarge
 )
-from app.core.security import get_password_hash, verify_password, get_current_user
-from app.services.user_services import create_tokens
+from app.core.security import (
+    get_password_hash, verify_password, get_current_user, get_current_principal,
+    get_read_session, read_refresh_token_payload, revoke_refresh_token
+)
+from app.core.rate_limiter import login_rate_limiter, register_rate_limiter
+from app.services.user_services import create_tokens, stream_users_ndjson
+from app.utils.pagination_utils import decode_cursor
+from app.utils.response_utils import trusted_response
 from app.schemas.token_schemas import AccessTokenSchema
 from app.schemas.response_schemas import SuccessResponseSchema
 from app.schemas.user_schemas import (
-    UserSchema, ListUsersSchema, NotificationTimeDeltaSchema,
-    UserNotificationsSchema
+    UserSchema, UserBaseSchema, ListUsersSchema, NotificationTimeDeltaSchema,
+    UserNotificationsSchema, BulkFollowSchema, BulkFollowResultSchema, FollowOutcomeSchema,
+    UpcomingBirthdaysSchema
 )
 from app.constants.user_constants import (
-    USER_REGISTER_BAD_RESPONSES, USER_LOGIN_BAD_RESPONSES, SUBSCRIPTION_BAD_RESPONSES
+    USER_REGISTER_BAD_RESPONSES, USER_LOGIN_BAD_RESPONSES, SUBSCRIPTION_BAD_RESPONSES,
+    NOTIFICATION_BAD_RESPONSES, PAGINATION_DEFAULT_LIMIT, PAGINATION_MAX_LIMIT,
+    UPCOMING_BIRTHDAYS_DEFAULT_DAYS, UPCOMING_BIRTHDAYS_MAX_DAYS
 )
 from database import crud
+from database.core import get_db_session
 
 
 router = APIRouter(prefix=USER_API_PREFIX)
 
 
+def _read_notification_timedelta(notification_time: time) -> timedelta:
+
+    if (notification_time.hour > 3 or
+        (notification_time.hour == 3 and (notification_time.minute > 0 or notification_time.second > 0))):
+        raise NotificationTimeTooLarge()
+
+    return timedelta(
+        hours=notification_time.hour,
+        minutes=notification_time.minute,
+        seconds=notification_time.second
+    )
+
+
 @router.post(
     "/register",
     response_model=AccessTokenSchema,
@@ -35,14 +61,21 @@ router = APIRouter(prefix=USER_API_PREFIX)
     description="Регистрация пользователя."
 )
 async def register(
+        request: Request,
         response: Response,
         username: Annotated[str, Form(..., description="Username пользователя. Пример: 'test_username'")],
         email: Annotated[EmailStr, Form(..., description="Email пользователя. Пример: 'temp_mail@temp.com'")],
         password: Annotated[str, Form(..., description="Пароль. Пример: 'qwerty'")],
         password_confirmation: Annotated[str, Form(..., description="Подтверждение пароля. Пример: 'qwerty'")],
         birthday: Annotated[date, Form(..., description="День рождения пользователя. Пример: '2024-01-01'")],
+        session: Annotated[AsyncSession, Depends(get_db_session)],
 ) -> AccessTokenSchema:
 
+    await register_rate_limiter.check(
+        ip=request.client.host if request.client else None,
+        username=username
+    )
+
     if password != password_confirmation:
         raise PasswordsDoNotMatch()
 
@@ -56,13 +89,14 @@ async def register(
 
     hashed_password = await get_password_hash(password)
     db_user = await crud.create_user(
+        session=session,
         username=username,
         email=email,
         hashed_password=hashed_password,
         birthday=birthday
     )
 
-    access_token, refresh_token = await create_tokens(user_id=db_user.id)
+    access_token, refresh_token = await create_tokens(session=session, user_id=db_user.id)
 
     response.set_cookie(
         key="refresh_token",
@@ -86,18 +120,25 @@ async def register(
     description="Логин пользователя."
 )
 async def login(
+        request: Request,
         response: Response,
+        session: Annotated[AsyncSession, Depends(get_db_session)],
         form_data: OAuth2PasswordRequestForm = Depends()
 ) -> AccessTokenSchema:
 
-    db_user = await crud.read_user_by_username(username=form_data.username)
+    await login_rate_limiter.check(
+        ip=request.client.host if request.client else None,
+        username=form_data.username
+    )
+
+    db_user = await crud.read_user_by_username(session=session, username=form_data.username)
 
     result_of_verifying_pass = await verify_password(form_data.password, db_user.hashed_password)
 
     if not result_of_verifying_pass:
         raise UserExistError()
 
-    access_token, refresh_token = await create_tokens(user_id=db_user.id)
+    access_token, refresh_token = await create_tokens(session=session, user_id=db_user.id)
 
     response.set_cookie(
         key="refresh_token",
@@ -117,13 +158,29 @@ async def login(
     "/logout",
     response_model=SuccessResponseSchema,
     tags=["User"],
-    description="Выход из аккаунта (удаляем рефреш из куки)."
+    description="Выход из аккаунта (отзываем рефреш и удаляем его из куки)."
 )
 async def logout(
         response: Response,
-        current_user: Annotated[UserSchema, Depends(get_current_user)]
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_db_session)],
+        refresh_token: Annotated[str | None, Cookie()] = None
 ) -> SuccessResponseSchema:
 
+    if refresh_token is not None:
+
+        try:
+            payload = await read_refresh_token_payload(token=refresh_token)
+        except HTTPException:
+            payload = None
+
+        if payload is not None and int(payload.get("sub")) == current_user.id:
+
+            try:
+                await revoke_refresh_token(session=session, payload=payload)
+            except TokenRevoked:
+                pass
+
     response.delete_cookie(
         key="refresh_token",
         httponly=True,
@@ -144,22 +201,83 @@ async def read_user_me(
         current_user: Annotated[UserSchema, Depends(get_current_user)]
 ) -> UserSchema:
 
-    return current_user
+    return trusted_response(current_user)
 
 
 @router.get(
     "/list-of-users",
     response_model=ListUsersSchema,
     tags=["User"],
-    description="Получение списка всех пользователей."
+    description="Получение списка пользователей (keyset-пагинация по id). "
+                "С stream=true весь список отдается потоком в формате NDJSON."
 )
 async def read_list_of_users(
-        current_user: Annotated[UserSchema, Depends(get_current_user)]
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)],
+        limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT, description="Размер страницы.")] = PAGINATION_DEFAULT_LIMIT,
+        after_id: Annotated[int | None, Query(description="ID последнего пользователя предыдущей страницы (next_after_id).")] = None,
+        stream: Annotated[bool, Query(description="Выгрузить весь список потоком NDJSON.")] = False
 ) -> ListUsersSchema:
 
-    users = await crud.read_list_of_users()
+    if stream:
+        return StreamingResponse(
+            content=stream_users_ndjson(),
+            media_type="application/x-ndjson"
+        )
+
+    users = await crud.read_list_of_users(
+        session=session,
+        limit=limit,
+        after_id=after_id
+    )
 
-    return users
+    return trusted_response(users)
+
+
+@router.get(
+    "/followers",
+    response_model=ListUsersSchema,
+    tags=["User"],
+    description="Подписчики текущего пользователя (keyset-пагинация по id)."
+)
+async def read_list_of_followers(
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)],
+        limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT, description="Размер страницы.")] = PAGINATION_DEFAULT_LIMIT,
+        after_id: Annotated[int | None, Query(description="ID последнего пользователя предыдущей страницы (next_after_id).")] = None
+) -> ListUsersSchema:
+
+    followers = await crud.read_list_of_followers(
+        session=session,
+        user_id=current_user.id,
+        limit=limit,
+        after_id=after_id
+    )
+
+    return trusted_response(followers)
+
+
+@router.get(
+    "/following",
+    response_model=ListUsersSchema,
+    tags=["User"],
+    description="Пользователи, на которых подписан текущий пользователь (keyset-пагинация по id)."
+)
+async def read_list_of_following(
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)],
+        limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT, description="Размер страницы.")] = PAGINATION_DEFAULT_LIMIT,
+        after_id: Annotated[int | None, Query(description="ID последнего пользователя предыдущей страницы (next_after_id).")] = None
+) -> ListUsersSchema:
+
+    following = await crud.read_list_of_following(
+        session=session,
+        user_id=current_user.id,
+        limit=limit,
+        after_id=after_id
+    )
+
+    return trusted_response(following)
 
 
 @router.post(
@@ -172,30 +290,23 @@ async def read_list_of_users(
 async def follow_user(
         following_user_id: Annotated[int, Path(title="ID user'а, на которого будет подписка.")],
         notification_timedelta: Annotated[NotificationTimeDeltaSchema, Body(...)],
-        current_user: Annotated[UserSchema, Depends(get_current_user)]
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_db_session)]
 ) -> SuccessResponseSchema:
 
-    notification_time = notification_timedelta.notification_timedelta
-
-    if (notification_time.hour > 3 or
-        (notification_time.hour == 3 and (notification_time.minute > 0 or notification_time.second > 0))):
-        raise NotificationTimeTooLarge()
+    notification_timedelta = _read_notification_timedelta(notification_timedelta.notification_timedelta)
 
     if following_user_id == current_user.id:
         raise SubscriptionError()
 
     subscribe = await crud.create_follow_user(
+        session=session,
         current_user_id=current_user.id,
         following_user_id=following_user_id
     )
 
-    notification_timedelta = timedelta(
-        hours=notification_time.hour,
-        minutes=notification_time.minute,
-        seconds=notification_time.second
-    )
-
     await crud.create_notification(
+        session=session,
         subscription_id=subscribe.id,
         following_user_id=following_user_id,
         notification_timedelta=notification_timedelta
@@ -206,6 +317,37 @@ async def follow_user(
     )
 
 
+@router.post(
+    "/follow-users",
+    response_model=BulkFollowResultSchema,
+    responses=NOTIFICATION_BAD_RESPONSES,
+    tags=["User"],
+    description="Подписка сразу на нескольких пользователей. "
+                "Для каждого ID возвращается результат: followed, already_following, not_found или self."
+)
+async def follow_users(
+        bulk_follow: Annotated[BulkFollowSchema, Body(...)],
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_db_session)]
+) -> BulkFollowResultSchema:
+
+    notification_timedelta = _read_notification_timedelta(bulk_follow.notification_timedelta)
+
+    outcomes = await crud.create_bulk_follow_users(
+        session=session,
+        current_user_id=current_user.id,
+        following_user_ids=bulk_follow.user_ids,
+        notification_timedelta=notification_timedelta
+    )
+
+    return BulkFollowResultSchema(
+        results=[
+            FollowOutcomeSchema(user_id=user_id, status=outcome)
+            for user_id, outcome in outcomes.items()
+        ]
+    )
+
+
 @router.delete(
     "/unfollow-user/{following_user_id}",
     response_model=SuccessResponseSchema,
@@ -214,10 +356,12 @@ async def follow_user(
 )
 async def unfollow_user(
         following_user_id: Annotated[int, Path(title="ID user'а, на которого будет подписка.")],
-        current_user: Annotated[UserSchema, Depends(get_current_user)]
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_db_session)]
 ) -> SuccessResponseSchema:
 
     await crud.delete_follow_user(
+        session=session,
         current_user_id=current_user.id,
         following_user_id=following_user_id
     )
@@ -234,11 +378,42 @@ async def unfollow_user(
     description="Получение списка всех будущих уведомлений о Днях Рождений."
 )
 async def get_list_of_notifications(
-        current_user: Annotated[UserSchema, Depends(get_current_user)]
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)],
+        limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT, description="Размер страницы.")] = PAGINATION_DEFAULT_LIMIT,
+        after: Annotated[str | None, Query(description="Курсор следующей страницы (next_cursor).")] = None
 ) -> UserNotificationsSchema:
 
     notifications = await crud.read_user_list_of_notifications(
-        user_id=current_user.id
+        session=session,
+        user_id=current_user.id,
+        limit=limit,
+        after=decode_cursor(after) if after is not None else None
+    )
+
+    return trusted_response(notifications)
+
+
+@router.get(
+    "/upcoming-birthdays",
+    response_model=UpcomingBirthdaysSchema,
+    tags=["User"],
+    description="Дни Рождения в ближайшие N дней: среди подписок (scope=following) или всех пользователей (scope=all)."
+)
+async def read_upcoming_birthdays(
+        current_user: Annotated[UserBaseSchema, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)],
+        days: Annotated[int, Query(ge=0, le=UPCOMING_BIRTHDAYS_MAX_DAYS, description="Количество дней вперед.")] = UPCOMING_BIRTHDAYS_DEFAULT_DAYS,
+        scope: Annotated[Literal["following", "all"], Query(description="Среди кого искать.")] = "following",
+        limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT, description="Максимальное количество записей.")] = PAGINATION_DEFAULT_LIMIT
+) -> UpcomingBirthdaysSchema:
+
+    birthdays = await crud.read_upcoming_birthdays(
+        session=session,
+        user_id=current_user.id,
+        days=days,
+        only_following=scope == "following",
+        limit=limit
     )
 
-    return notifications
+    return trusted_response(birthdays)
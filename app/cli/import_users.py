@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from app.services.import_services import import_users
+from database.core import engine
+
+
+async def run(users_path: str, subscriptions_path: str | None, batch_size: int) -> dict:
+    try:
+        return await import_users(
+            users_path=users_path,
+            subscriptions_path=subscriptions_path,
+            batch_size=batch_size
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Массовый импорт пользователей (пароли уже захешированы) через COPY."
+    )
+    parser.add_argument(
+        "users",
+        help="CSV/NDJSON с полями username, email, hashed_password, birthday (YYYY-MM-DD)."
+    )
+    parser.add_argument(
+        "--subscriptions",
+        help="CSV/NDJSON с полями follower_username, followed_username, notification_timedelta (HH:MM:SS)."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="Количество строк в одном COPY-пакете."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    report = asyncio.run(
+        run(
+            users_path=args.users,
+            subscriptions_path=args.subscriptions,
+            batch_size=args.batch_size
+        )
+    )
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
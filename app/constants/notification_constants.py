@@ -0,0 +1,39 @@
+NOTIFICATION_SCHEDULER_WINDOW_SIZE = 10_000
+
+NOTIFICATION_SCHEDULER_LOW_WATERMARK = 1_000
+
+NOTIFICATION_SCHEDULER_BATCH_SIZE = 100
+
+NOTIFICATION_SCHEDULER_RETRY_DELAY_SECONDS = 60
+
+NOTIFICATION_CHANNEL = "notification_changes"
+
+SUBSCRIPTION_CHANNEL = "subscription_changes"
+
+DATABASE_LISTENER_RECONNECT_SECONDS = 5
+
+DATABASE_LISTENER_KEEPALIVE_SECONDS = 60
+
+EMAIL_OUTBOX_CHANNEL = "email_outbox_changes"
+
+EMAIL_OUTBOX_STATUS_PENDING = "pending"
+
+EMAIL_OUTBOX_STATUS_SENDING = "sending"
+
+EMAIL_OUTBOX_STATUS_DEAD = "dead"
+
+EMAIL_OUTBOX_BATCH_SIZE = 20
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+
+EMAIL_OUTBOX_BACKOFF_BASE_SECONDS = 30
+
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = 3600
+
+EMAIL_OUTBOX_LEASE_SECONDS = 600
+
+EMAIL_OUTBOX_LEASE_EXPIRED_ERROR = "Аренда истекла: отправка не была завершена."
+
+BIRTHDAY_EMAIL_SUBJECT = "Напоминание о Дне Рождения!"
+
+BIRTHDAY_EMAIL_TEMPLATE = "Скоро у пользователя %s День Рождения!"
@@ -0,0 +1,17 @@
+SERVICE_API_PREFIX = "/service"
+
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS = 2
+
+REPLICA_LAST_WRITE_COOKIE = "last_write_at"
+
+REPLICA_WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+SERVICE_RETRY_AFTER_SECONDS = 1
+
+SERVICE_METRICS_TOKEN_HEADER = "X-Metrics-Token"
+
+SERVICE_DETAIL = {
+    403: "Недостаточно прав для просмотра метрик.",
+    404: "Not Found",
+    503: "Сервис перегружен, повторите попытку позже.",
+}
@@ -11,3 +11,48 @@ TOKEN_HEADERS = {
 }
 
 OAUTH2_URL = "/api/v1/user/login"
+
+PRINCIPAL_CACHE_TTL_SECONDS = 30
+
+PRINCIPAL_CACHE_MAX_SIZE = 10_000
+
+REVOCATION_SYNC_INTERVAL_SECONDS = 5
+
+REVOCATION_SYNC_OVERLAP_SECONDS = 60
+
+TOKEN_REFRESH_BAD_RESPONSES = {
+    400: {
+        "description": "Error: Bad Request",
+        "content":
+            {
+                "application/json":
+                    {
+                        "example": {"detail": "Неверные учетные данные для аутентификации."}
+                    }
+            }
+    },
+    401: {
+        "description": "Error: Unauthorized",
+        "content":
+            {
+                "application/json":
+                    {
+                        "example": {"detail": "Токен отозван."}
+                    }
+            }
+    },
+}
+
+TOKEN_LEDGER_FLUSH_INTERVAL_SECONDS = 0.05
+
+TOKEN_LEDGER_BATCH_SIZE = 500
+
+TOKEN_LEDGER_SHUTDOWN_RETRIES = 5
+
+TOKEN_LEDGER_MAX_BUFFER_SIZE = 50_000
+
+TOKEN_PURGE_INTERVAL_MINUTES = 10
+
+TOKEN_PURGE_BATCH_SIZE = 5_000
+
+TOKEN_PURGE_PAUSE_SECONDS = 0.5
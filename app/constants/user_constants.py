@@ -1,5 +1,32 @@
 USER_API_PREFIX = "/user"
 
+RATE_LIMIT_DETAIL = {
+    429: "Слишком много попыток, повторите позже.",
+}
+
+RATE_LIMIT_RESPONSE = {
+    "description": "Error: Too Many Requests",
+    "content":
+        {
+            "application/json":
+                {
+                    "example": {"detail": RATE_LIMIT_DETAIL.get(429)}
+                }
+        }
+}
+
+LOGIN_RATE_LIMITS = {
+    "ip": (20, 60),
+    "username": (5, 60),
+}
+
+REGISTER_RATE_LIMITS = {
+    "ip": (5, 60),
+    "username": (3, 60),
+}
+
+RATE_LIMIT_MAX_KEYS = 100_000
+
 USER_REGISTER_DETAIL = {
     400: "Такого домена электронной почты не существует.",
     406: "Пароли не совпадают.",
@@ -47,7 +74,8 @@ USER_REGISTER_BAD_RESPONSES = {
                         "example": {"detail": USER_REGISTER_DETAIL.get(413)}
                     }
             }
-    }
+    },
+    429: RATE_LIMIT_RESPONSE,
 }
 
 
@@ -76,7 +104,8 @@ USER_LOGIN_BAD_RESPONSES = {
                         "example": {"detail": USER_LOGIN_DETAIL.get(404)}
                     }
             }
-    }
+    },
+    429: RATE_LIMIT_RESPONSE,
 }
 
 
@@ -119,6 +148,31 @@ SUBSCRIPTION_BAD_RESPONSES = {
     },
 }
 
+BULK_FOLLOW_MAX_USERS = 500
+
+FOLLOW_OUTCOME_FOLLOWED = "followed"
+
+FOLLOW_OUTCOME_ALREADY_FOLLOWING = "already_following"
+
+FOLLOW_OUTCOME_NOT_FOUND = "not_found"
+
+FOLLOW_OUTCOME_SELF = "self"
+
+
+PAGINATION_DETAIL = {
+    400: "Некорректный курсор пагинации.",
+}
+
+PAGINATION_DEFAULT_LIMIT = 100
+
+PAGINATION_MAX_LIMIT = 500
+
+USERS_STREAM_PARTITION_SIZE = 1_000
+
+UPCOMING_BIRTHDAYS_DEFAULT_DAYS = 7
+
+UPCOMING_BIRTHDAYS_MAX_DAYS = 366
+
 
 NOTIFICATION_DETAIL = {
     400: "Время для уведомления о Дне Рождения не может превышать 3 часа!"
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.exceptions.service_exceptions import ServiceOverloaded
+from settings.loader import PASSWORD_HASHING_WORKERS, PASSWORD_HASHING_QUEUE_SIZE
+
+
+class BoundedPasswordHasher:
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.max_workers + self.max_queue_size:
+            self.rejected += 1
+            raise ServiceOverloaded()
+
+        self._in_flight += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, wait_seconds, hash_seconds = await loop.run_in_executor(
+                self._executor, self._timed_call, time.perf_counter(), func, args
+            )
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.total_hash_seconds += hash_seconds
+        self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+
+        return result
+
+    def _timed_call(self, submitted_at: float, func: Callable[..., Any], args: tuple) -> tuple[Any, float, float]:
+        started_at = time.perf_counter()
+
+        with self._lock:
+            self._running += 1
+
+        try:
+            result = func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+        finished_at = time.perf_counter()
+
+        return result, started_at - submitted_at, finished_at - started_at
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = self._running
+
+        completed = self.completed
+
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "running": running,
+            "queue_depth": max(self._in_flight - running, 0),
+            "completed": completed,
+            "rejected": self.rejected,
+            "avg_hash_ms": round(self.total_hash_seconds / completed * 1000, 2) if completed else 0.0,
+            "max_hash_ms": round(self.max_hash_seconds * 1000, 2),
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = BoundedPasswordHasher(
+    max_workers=PASSWORD_HASHING_WORKERS,
+    max_queue_size=PASSWORD_HASHING_QUEUE_SIZE
+)
@@ -0,0 +1,96 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+from app.constants.user_constants import (
+    LOGIN_RATE_LIMITS, REGISTER_RATE_LIMITS, RATE_LIMIT_MAX_KEYS
+)
+from app.exceptions.user_exceptions import TooManyAttempts
+
+
+class RateLimitBackend(ABC):
+    """Хранилище счетчиков попыток.
+
+    hit() регистрирует попытку по ключу и возвращает количество секунд,
+    через которое ее можно повторить (0 - попытка разрешена). Реализация
+    поверх общего хранилища позволяет делить лимиты между воркерами.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        ...
+
+
+class InMemorySlidingWindowBackend(RateLimitBackend):
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._windows: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        attempts = self._windows.get(key)
+
+        if attempts is None:
+            attempts = deque()
+            self._windows[key] = attempts
+
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+
+        self._windows.move_to_end(key)
+
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+
+        if len(attempts) >= limit:
+            return attempts[0] + window - now
+
+        attempts.append(now)
+
+        return 0
+
+
+class RateLimiter:
+
+    def __init__(
+            self,
+            name: str,
+            limits: dict[str, tuple[int, float]],
+            backend: RateLimitBackend
+    ):
+        self.name = name
+        self.limits = limits
+        self.backend = backend
+
+    async def check(self, **keys: str | None) -> None:
+        for scope, value in keys.items():
+
+            if value is None or scope not in self.limits:
+                continue
+
+            limit, window = self.limits[scope]
+            retry_after = await self.backend.hit(
+                key=f"{self.name}:{scope}:{value}",
+                limit=limit,
+                window=window
+            )
+
+            if retry_after > 0:
+                raise TooManyAttempts(retry_after=math.ceil(retry_after))
+
+
+rate_limit_backend: RateLimitBackend = InMemorySlidingWindowBackend()
+
+login_rate_limiter = RateLimiter(
+    name="login",
+    limits=LOGIN_RATE_LIMITS,
+    backend=rate_limit_backend
+)
+
+register_rate_limiter = RateLimiter(
+    name="register",
+    limits=REGISTER_RATE_LIMITS,
+    backend=rate_limit_backend
+)
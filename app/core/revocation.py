@@ -0,0 +1,66 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+from app.constants.token_constants import REVOCATION_SYNC_OVERLAP_SECONDS
+from database import crud
+from database.core import AsyncSessionManager
+
+
+class RevokedTokenRegistry:
+
+    def __init__(self, sync_overlap: timedelta):
+        self.sync_overlap = sync_overlap
+        self._revoked: dict[str, int] = {}
+        self._synced_at: datetime | None = None
+        self._watermark: datetime | None = None
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def add(self, jti: str, exp: int) -> None:
+        self._revoked[jti] = exp
+
+    async def load(self) -> None:
+        self._synced_at = None
+        self._watermark = None
+        self._revoked.clear()
+        await self.sync()
+
+    async def sync(self) -> None:
+        since = self._watermark - self.sync_overlap if self._watermark is not None else None
+
+        try:
+            async with AsyncSessionManager() as session:
+                revoked_tokens = await crud.read_revoked_tokens(session=session, since=since)
+        except Exception as e:
+            logging.error(f"Ошибка синхронизации отозванных токенов: {e}")
+            return
+
+        for revoked_token in revoked_tokens:
+            self._revoked[revoked_token.jti] = revoked_token.exp
+
+            if self._watermark is None or revoked_token.blacklisted_at > self._watermark:
+                self._watermark = revoked_token.blacklisted_at
+
+        self._synced_at = datetime.now()
+        self._prune()
+
+    def _prune(self) -> None:
+        now = int(time.time())
+        expired = [jti for jti, exp in self._revoked.items() if exp < now]
+
+        for jti in expired:
+            del self._revoked[jti]
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._revoked),
+            "synced_at": self._synced_at.isoformat() if self._synced_at else None,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+        }
+
+
+revoked_tokens = RevokedTokenRegistry(
+    sync_overlap=timedelta(seconds=REVOCATION_SYNC_OVERLAP_SECONDS)
+)
@@ -1,21 +1,32 @@
 import logging
+import secrets
 import uuid
 from jose import jwt, JWTError
-from fastapi import Depends
-from typing import Annotated
+from fastapi import Cookie, Depends, Header
+from typing import Annotated, AsyncIterator
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import OperationalError, InterfaceError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.utils.user_utils import unix_time_millis
-from settings.loader import SECRET_KEY
+from settings.loader import SECRET_KEY, SERVICE_METRICS_TOKEN
 from app.constants.token_constants import (
     ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS, OAUTH2_URL
 )
-from app.exceptions.token_exceptions import InvalidAuthenticationCredentials, TokenExpired
+from app.constants.service_constants import SERVICE_METRICS_TOKEN_HEADER, REPLICA_LAST_WRITE_COOKIE
+from app.exceptions.token_exceptions import InvalidAuthenticationCredentials, TokenExpired, TokenRevoked
+from app.exceptions.service_exceptions import MetricsAccessDenied, MetricsDisabled
+from app.core.cache import principal_cache
+from app.core.hashing import password_hasher
+from app.core.revocation import revoked_tokens
 from database import crud
-from app.schemas.user_schemas import UserSchema
+from database.core import get_db_session, on_commit, ReplicaSessionManager
+from database.replica import replica_router
+from database.token_ledger import refresh_token_ledger
+from app.schemas.user_schemas import UserSchema, UserBaseSchema
 
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -46,7 +57,7 @@ async def create_access_token(sub: str) -> str:
     return encoded_jwt
 
 
-async def create_refresh_token(sub: str) -> str:
+async def create_refresh_token(session: AsyncSession, sub: str) -> str:
     to_encode = {
         "sub": sub,
         "exp": datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
@@ -59,37 +70,33 @@ async def create_refresh_token(sub: str) -> str:
         SECRET_KEY,
         algorithm=ALGORITHM
     )
-    await crud.create_refresh_token(
-        token=encoded_jwt,
+    on_commit(session, lambda: refresh_token_ledger.add(
         exp=int(to_encode.get("exp")),
         iat=int(to_encode.get("iat")),
         jti=to_encode.get("jti"),
         user_id=int(to_encode.get("sub")),
-    )
+    ))
 
     return encoded_jwt
 
 
 async def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
 
 
 async def get_password_hash(password):
-    return pwd_context.hash(password)
+    return await password_hasher.run(pwd_context.hash, password)
 
 
-async def get_current_user(
-        token: Annotated[str, Depends(oauth2_scheme)]
-) -> UserSchema:
+async def read_token_payload(token: str, token_type: str) -> dict:
     try:
         payload = jwt.decode(
             token,
             SECRET_KEY,
             algorithms=ALGORITHM
         )
-        user_id = str(payload.get("sub"))
 
-        if user_id is None:
+        if payload.get("sub") is None or payload.get("token_type") != token_type:
             raise InvalidAuthenticationCredentials()
 
         token_expired: int = payload.get("exp")
@@ -103,6 +110,110 @@ async def get_current_user(
         logging.error(f"JWTError: {e}")
         raise InvalidAuthenticationCredentials()
 
-    user: UserSchema = await crud.read_user_by_user_id(user_id=int(user_id))
+    return payload
+
+
+async def read_token_subject(token: str) -> int:
+    payload = await read_token_payload(token=token, token_type="access")
+
+    return int(payload.get("sub"))
+
+
+async def read_refresh_token_payload(token: str | None) -> dict:
+    if token is None:
+        raise InvalidAuthenticationCredentials()
+
+    payload = await read_token_payload(token=token, token_type="refresh")
+
+    if revoked_tokens.is_revoked(payload.get("jti")):
+        raise TokenRevoked()
+
+    return payload
+
+
+async def revoke_refresh_token(session: AsyncSession, payload: dict) -> None:
+    await crud.create_blacklisted_token(
+        session=session,
+        exp=int(payload.get("exp")),
+        iat=int(payload.get("iat")),
+        jti=payload.get("jti"),
+        user_id=int(payload.get("sub")),
+    )
+
+    on_commit(session, lambda: revoked_tokens.add(jti=payload.get("jti"), exp=int(payload.get("exp"))))
+
+
+async def get_token_subject(
+        token: Annotated[str, Depends(oauth2_scheme)]
+) -> int:
+    return await read_token_subject(token)
+
+
+async def get_read_session(
+        session: Annotated[AsyncSession, Depends(get_db_session)],
+        last_write_at: Annotated[str | None, Cookie(alias=REPLICA_LAST_WRITE_COOKIE)] = None
+) -> AsyncIterator[AsyncSession]:
+    if not replica_router.use_replica(last_write_at):
+        yield session
+        return
+
+    async with ReplicaSessionManager() as replica_session:
+
+        try:
+            await replica_session.connection()
+        except (OperationalError, InterfaceError, OSError) as e:
+            replica_router.fall_back(e)
+        else:
+
+            try:
+                yield replica_session
+            except (OperationalError, InterfaceError, OSError) as e:
+                replica_router.mark_unhealthy(e)
+                raise
+
+            return
+
+    yield session
+
+
+async def get_current_user(
+        user_id: Annotated[int, Depends(get_token_subject)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> UserSchema:
+    user: UserSchema | None = principal_cache.get(user_id)
+
+    if user is None:
+        user = await crud.read_user_by_user_id(session=session, user_id=user_id)
+
+        if not replica_router.is_replica(session):
+            principal_cache.set(user.id, user)
 
     return user
+
+
+async def get_current_principal(
+        user_id: Annotated[int, Depends(get_token_subject)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> UserBaseSchema:
+    user: UserSchema | None = principal_cache.get(user_id)
+
+    if user is not None:
+        return UserBaseSchema(
+            id=user.id,
+            username=user.username,
+            email=user.email
+        )
+
+    principal = await crud.read_user_base_by_user_id(session=session, user_id=user_id)
+
+    return principal
+
+
+async def verify_metrics_token(
+        token: Annotated[str | None, Header(alias=SERVICE_METRICS_TOKEN_HEADER)] = None
+) -> None:
+    if not SERVICE_METRICS_TOKEN:
+        raise MetricsDisabled()
+
+    if token is None or not secrets.compare_digest(token, SERVICE_METRICS_TOKEN):
+        raise MetricsAccessDenied()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from aiosmtplib import SMTP, SMTPResponseException, SMTPServerDisconnected
+from fastapi_mail import ConnectionConfig
+
+from settings.loader import EMAIL_CONFIGURATION, SMTP_POOL_SIZE, SMTP_POOL_MAX_IDLE_SECONDS
+
+
+class SMTPConnectionPool:
+
+    def __init__(self, config: ConnectionConfig, max_size: int, max_idle: float):
+        self.config = config
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.opened = 0
+        self.reused = 0
+        self.reconnects = 0
+        self.sent = 0
+        self._idle: list[tuple[SMTP, float]] = []
+        self._in_use = 0
+        self._semaphore = asyncio.Semaphore(max_size)
+
+    def build_message(self, text: str, subject: str, recipients: list[str], subtype: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = formataddr((self.config.MAIL_FROM_NAME or "", self.config.MAIL_FROM))
+        message["To"] = ", ".join(recipients)
+        message["Subject"] = subject
+        message.set_content(text, subtype=subtype)
+
+        return message
+
+    async def _connect(self) -> SMTP:
+        smtp = SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            timeout=self.config.TIMEOUT
+        )
+        await smtp.connect()
+
+        try:
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value())
+        except Exception:
+            smtp.close()
+            raise
+
+        self.opened += 1
+
+        return smtp
+
+    async def _acquire(self) -> SMTP:
+        now = time.monotonic()
+
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+
+            if smtp.is_connected and now - released_at < self.max_idle:
+                self.reused += 1
+                return smtp
+
+            smtp.close()
+
+        return await self._connect()
+
+    def _release(self, smtp: SMTP) -> None:
+        if smtp.is_connected:
+            self._idle.append((smtp, time.monotonic()))
+
+    async def send(self, message: EmailMessage) -> None:
+        async with self._semaphore:
+            self._in_use += 1
+
+            try:
+                smtp = await self._acquire()
+
+                try:
+
+                    try:
+                        await smtp.send_message(message)
+                    except SMTPServerDisconnected:
+                        smtp.close()
+                        self.reconnects += 1
+                        smtp = await self._connect()
+                        await smtp.send_message(message)
+
+                except SMTPResponseException:
+                    self._release(smtp)
+                    raise
+                except Exception:
+                    smtp.close()
+                    raise
+
+                self._release(smtp)
+                self.sent += 1
+
+            finally:
+                self._in_use -= 1
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+
+        for smtp, _ in idle:
+
+            if not smtp.is_connected:
+                smtp.close()
+                continue
+
+            try:
+                await smtp.quit()
+            except Exception as e:
+                logging.warning(f"Не удалось корректно закрыть SMTP-соединение: {e}")
+                smtp.close()
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "opened": self.opened,
+            "reused": self.reused,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+        }
+
+
+smtp_pool = SMTPConnectionPool(
+    config=EMAIL_CONFIGURATION,
+    max_size=SMTP_POOL_SIZE,
+    max_idle=SMTP_POOL_MAX_IDLE_SECONDS
+)
@@ -1,3 +1,6 @@
+from fastapi import HTTPException, status
+
+
 EMAIL_SENDING_ERROR = {
     500: "Ошибка отправки email-сообщения"
 }
@@ -14,3 +17,11 @@ EMAIL_SENDING_RESPONSES = {
             }
     }
 }
+
+
+class EmailSendingError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=EMAIL_SENDING_ERROR.get(500)
+        )
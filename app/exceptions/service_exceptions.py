@@ -0,0 +1,28 @@
+from fastapi import HTTPException, status
+
+from app.constants.service_constants import SERVICE_DETAIL, SERVICE_RETRY_AFTER_SECONDS
+
+
+class MetricsAccessDenied(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=SERVICE_DETAIL.get(403)
+        )
+
+
+class MetricsDisabled(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=SERVICE_DETAIL.get(404)
+        )
+
+
+class ServiceOverloaded(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=SERVICE_DETAIL.get(503),
+            headers={"Retry-After": str(SERVICE_RETRY_AFTER_SECONDS)}
+        )
@@ -19,3 +19,12 @@ class TokenExpired(HTTPException):
             detail="Срок действия токена истек.",
             headers=TOKEN_HEADERS.get("headers")
         )
+
+
+class TokenRevoked(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен отозван.",
+            headers=TOKEN_HEADERS.get("headers")
+        )
@@ -2,7 +2,8 @@ from fastapi import HTTPException, status
 
 from app.constants.user_constants import (
     USER_REGISTER_DETAIL, USER_LOGIN_DETAIL,
-    SUBSCRIPTION_DETAIL, NOTIFICATION_DETAIL
+    SUBSCRIPTION_DETAIL, NOTIFICATION_DETAIL, RATE_LIMIT_DETAIL,
+    PAGINATION_DETAIL
 )
 
 
@@ -84,3 +85,20 @@ class NotificationTimeTooLarge(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=NOTIFICATION_DETAIL.get(400)
         )
+
+
+class TooManyAttempts(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=RATE_LIMIT_DETAIL.get(429),
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class InvalidPaginationCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=PAGINATION_DETAIL.get(400)
+        )
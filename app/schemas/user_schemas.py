@@ -1,6 +1,11 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
-from datetime import time, datetime
+from typing import List, Literal, Optional
+from datetime import time, datetime, date
+
+from app.constants.user_constants import (
+    BULK_FOLLOW_MAX_USERS, FOLLOW_OUTCOME_FOLLOWED, FOLLOW_OUTCOME_ALREADY_FOLLOWING,
+    FOLLOW_OUTCOME_NOT_FOUND, FOLLOW_OUTCOME_SELF
+)
 
 
 class UserBaseSchema(BaseModel):
@@ -13,6 +18,8 @@ class UserSchema(BaseModel):
     id: int
     username: str
     email: EmailStr
+    followers_count: int
+    following_count: int
     followers: List[Optional["UserBaseSchema"]]
     following: List[Optional["UserBaseSchema"]]
 
@@ -24,6 +31,7 @@ class UserEmailSchema(BaseModel):
 
 class ListUsersSchema(BaseModel):
     users: List["UserBaseSchema"]
+    next_after_id: Optional[int] = None
 
 
 class NotificationTimeDeltaSchema(BaseModel):
@@ -35,10 +43,51 @@ class NotificationTimeDeltaSchema(BaseModel):
     )
 
 
+class BulkFollowSchema(BaseModel):
+    user_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_FOLLOW_MAX_USERS,
+        description="ID пользователей, на которых нужно подписаться.",
+        example=[2, 3, 4]
+    )
+    notification_timedelta: time = Field(
+        ...,
+        description="Время до ДР, когда нужно отправить уведомление. "
+                    "Например, '00:30:00' для уведомления за 30 мин до ДР.",
+        example="00:30:00"
+    )
+
+
+class FollowOutcomeSchema(BaseModel):
+    user_id: int
+    status: Literal[
+        FOLLOW_OUTCOME_FOLLOWED, FOLLOW_OUTCOME_ALREADY_FOLLOWING, FOLLOW_OUTCOME_NOT_FOUND, FOLLOW_OUTCOME_SELF
+    ] = Field(
+        ...,
+        description="followed | already_following | not_found | self"
+    )
+
+
+class BulkFollowResultSchema(BaseModel):
+    results: List["FollowOutcomeSchema"]
+
+
 class UserNotificationsSchema(BaseModel):
     notifications: List["UserNotificationSchema"]
+    next_cursor: Optional[str] = None
 
 
 class UserNotificationSchema(BaseModel):
     notification_time: datetime
     user: "UserBaseSchema"
+
+
+class UpcomingBirthdaySchema(BaseModel):
+    user: "UserBaseSchema"
+    birthday: date
+    next_birthday: date
+
+
+class UpcomingBirthdaysSchema(BaseModel):
+    birthdays: List["UpcomingBirthdaySchema"]
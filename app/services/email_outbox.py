@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from fastapi_mail import MessageType
+
+from app.constants.notification_constants import (
+    EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS, EMAIL_OUTBOX_LEASE_SECONDS, EMAIL_OUTBOX_STATUS_PENDING,
+    EMAIL_OUTBOX_STATUS_SENDING, EMAIL_OUTBOX_STATUS_DEAD
+)
+from app.services.email_services import send_message_to_email
+from database import crud
+from database.core import AsyncSessionManager
+from database.query_stats import track_queries
+
+
+class EmailOutboxSender:
+
+    def __init__(
+            self,
+            batch_size: int,
+            max_attempts: int,
+            backoff_base: float,
+            backoff_max: float,
+            lease: float
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = timedelta(seconds=lease)
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def handle_event(self, event: dict) -> None:
+        self._wakeup.set()
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max))
+
+    @track_queries("email_outbox.send_batch")
+    async def _send_batch(self) -> int:
+        leased_until = datetime.now() + self.lease
+
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+                claimed = await crud.claim_pending_emails(
+                    session=session,
+                    limit=self.batch_size,
+                    leased_until=leased_until,
+                    max_attempts=self.max_attempts
+                )
+
+        emails = [email for email in claimed if email.status == EMAIL_OUTBOX_STATUS_SENDING]
+        expired = len(claimed) - len(emails)
+
+        if expired:
+            logging.error(f"Письма с истекшей арендой переведены в dead-letter: {expired}")
+            self.dead += expired
+
+        if not emails:
+            return len(claimed)
+
+        results = await asyncio.gather(
+            *(
+                send_message_to_email(
+                    text=email.body,
+                    subject=email.subject,
+                    recipients=[email.recipient],
+                    subtype=MessageType.plain
+                )
+                for email in emails
+            ),
+            return_exceptions=True
+        )
+
+        sent_email_ids = []
+        failed_emails = []
+
+        for email, result in zip(emails, results):
+
+            if isinstance(result, Exception):
+                failed_emails.append({
+                    "id": email.id,
+                    "last_error": repr(result.__cause__ or result),
+                    "status": EMAIL_OUTBOX_STATUS_DEAD if email.attempts >= self.max_attempts
+                    else EMAIL_OUTBOX_STATUS_PENDING,
+                    "next_attempt_at": datetime.now() + self._backoff(email.attempts),
+                })
+                continue
+
+            sent_email_ids.append(email.id)
+
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+
+                if sent_email_ids:
+                    await crud.delete_sent_emails(session=session, email_ids=sent_email_ids)
+
+                if failed_emails:
+                    await crud.update_failed_emails(
+                        session=session,
+                        failed_emails=failed_emails,
+                        leased_until=leased_until
+                    )
+
+        dead = sum(email["status"] == EMAIL_OUTBOX_STATUS_DEAD for email in failed_emails)
+
+        if dead:
+            logging.error(f"Письма переведены в dead-letter: {dead}")
+
+        self.sent += len(sent_email_ids)
+        self.failed += len(failed_emails)
+        self.dead += dead
+
+        return len(claimed)
+
+    async def _tick(self) -> None:
+        self._wakeup.clear()
+
+        while await self._send_batch() == self.batch_size:
+            pass
+
+        async with AsyncSessionManager() as session:
+            next_attempt_at = await crud.read_next_email_attempt_at(session=session)
+
+        timeout = max((next_attempt_at - datetime.now()).total_seconds(), 1) if next_attempt_at else None
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+
+            try:
+                await self._tick()
+            except Exception as e:
+                logging.error(f"Ошибка отправки писем из outbox: {e}")
+                await asyncio.sleep(self.backoff_base)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "dead": self.dead,
+        }
+
+
+email_outbox_sender = EmailOutboxSender(
+    batch_size=EMAIL_OUTBOX_BATCH_SIZE,
+    max_attempts=EMAIL_OUTBOX_MAX_ATTEMPTS,
+    backoff_base=EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+    lease=EMAIL_OUTBOX_LEASE_SECONDS
+)
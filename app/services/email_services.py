@@ -1,36 +1,20 @@
 import logging
 from typing import List
-from fastapi_mail import FastMail, MessageSchema, MessageType
+from fastapi_mail import MessageType
 
-from settings.loader import EMAIL_CONFIGURATION
-from app.exceptions.email_exceptions import EMAIL_SENDING_ERROR
+from app.core.smtp_pool import smtp_pool
+from app.exceptions.email_exceptions import EmailSendingError
 from database import crud
+from database.core import AsyncSessionManager
 
 
-async def notify_about_birthday() -> None:
+async def enqueue_birthday_emails(batch_size: int) -> int:
 
-    notifications = await crud.read_list_of_notifications_to_send_email()
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            enqueued = await crud.enqueue_due_birthday_emails(session=session, limit=batch_size)
 
-    if notifications is not None:
-
-        for notification in notifications:
-
-            subscribe = await crud.read_subscribe_by_id(
-                subscribe_id=notification.subscription_id
-            )
-
-            user_to_notify = await crud.read_user_email_by_user_id(user_id=subscribe.follower_id)
-
-            user_notify_about = await crud.read_user_email_by_user_id(user_id=subscribe.followed_id)
-
-            await send_message_to_email(
-                text=f"Скоро у пользователя {user_notify_about.email} День Рождения!",
-                subject="Напоминание о Дне Рождения!",
-                recipients=[user_to_notify.email],
-                subtype=MessageType.plain
-            )
-
-            await crud.update_notification_time_by_id(notification_id=notification.id)
+    return enqueued
 
 
 async def send_message_to_email(
@@ -42,18 +26,16 @@ async def send_message_to_email(
 
     try:
 
-        message = MessageSchema(
+        message = smtp_pool.build_message(
+            text=text,
             subject=subject,
             recipients=recipients,
-            body=text,
-            subtype=subtype
+            subtype=subtype.value
         )
 
-        fm = FastMail(EMAIL_CONFIGURATION)
-
-        await fm.send_message(message=message)
+        await smtp_pool.send(message)
 
     except Exception as e:
 
         logging.error(f"Не удалось отправить сообщение: {e}")
-        raise EMAIL_SENDING_ERROR()
+        raise EmailSendingError() from e
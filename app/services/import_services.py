@@ -0,0 +1,214 @@
+import csv
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterator
+from sqlalchemy import (
+    Table, MetaData, Column, String, Date, Interval,
+    select, insert as sa_insert
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import aliased
+
+from database import statements
+from database.core import engine
+from database.expressions import next_notification_time
+from database.models import User, Subscribe, Notification
+
+
+_staging_metadata = MetaData()
+
+user_import_table = Table(
+    "user_import",
+    _staging_metadata,
+    Column("username", String),
+    Column("email", String),
+    Column("hashed_password", String),
+    Column("birthday", Date),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
+
+subscribe_import_table = Table(
+    "subscribe_import",
+    _staging_metadata,
+    Column("follower_username", String),
+    Column("followed_username", String),
+    Column("notification_timedelta", Interval),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
+
+
+def _read_records(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as file:
+
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def _parse_timedelta(value: str | None) -> timedelta:
+    if not value:
+        return timedelta()
+
+    hours, minutes, seconds = (int(part) for part in value.split(":"))
+
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _batches(records: Iterator[tuple], batch_size: int) -> Iterator[list[tuple]]:
+    batch = []
+
+    for record in records:
+        batch.append(record)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def read_user_records(path: str) -> Iterator[tuple]:
+    for record in _read_records(path):
+        yield (
+            record["username"],
+            record["email"],
+            record["hashed_password"],
+            date.fromisoformat(record["birthday"]),
+        )
+
+
+def read_subscribe_records(path: str) -> Iterator[tuple]:
+    for record in _read_records(path):
+        yield (
+            record["follower_username"],
+            record["followed_username"],
+            _parse_timedelta(record.get("notification_timedelta")),
+        )
+
+
+async def import_users(
+        users_path: str,
+        subscriptions_path: str | None = None,
+        batch_size: int = 10_000
+) -> dict:
+
+    started_at = time.perf_counter()
+    report = {
+        "users_read": 0,
+        "users_inserted": 0,
+        "subscriptions_read": 0,
+        "subscriptions_inserted": 0,
+        "notifications_inserted": 0,
+    }
+
+    async with engine.connect() as connection:
+
+        await connection.run_sync(_staging_metadata.create_all)
+
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        for batch in _batches(read_user_records(users_path), batch_size):
+            await driver_connection.copy_records_to_table(
+                user_import_table.name,
+                records=batch,
+                columns=[column.name for column in user_import_table.columns]
+            )
+            report["users_read"] += len(batch)
+            logging.info(f"Импорт: загружено {report['users_read']} пользователей")
+
+        statement = insert(User).from_select(
+            ["username", "email", "hashed_password", "birthday"],
+            select(
+                user_import_table.c.username,
+                user_import_table.c.email,
+                user_import_table.c.hashed_password,
+                user_import_table.c.birthday
+            )
+        ).on_conflict_do_nothing()
+        result = await connection.execute(statement)
+        report["users_inserted"] = result.rowcount
+
+        if subscriptions_path is not None:
+
+            for batch in _batches(read_subscribe_records(subscriptions_path), batch_size):
+                await driver_connection.copy_records_to_table(
+                    subscribe_import_table.name,
+                    records=batch,
+                    columns=[column.name for column in subscribe_import_table.columns]
+                )
+                report["subscriptions_read"] += len(batch)
+
+            subscriptions = await _create_imported_subscriptions(connection)
+            report["subscriptions_inserted"] = subscriptions
+            report["notifications_inserted"] = subscriptions
+
+            await connection.execute(statements.RECOUNT_FOLLOWERS)
+            await connection.execute(statements.RECOUNT_FOLLOWING)
+
+        await connection.commit()
+
+    elapsed = time.perf_counter() - started_at
+    report["seconds"] = round(elapsed, 2)
+    report["users_per_second"] = round(report["users_read"] / elapsed) if elapsed else 0
+
+    return report
+
+
+async def _create_imported_subscriptions(connection: AsyncConnection) -> int:
+    follower = aliased(User)
+    followed = aliased(User)
+
+    staged = select(
+        subscribe_import_table.c.follower_username,
+        subscribe_import_table.c.followed_username,
+        subscribe_import_table.c.notification_timedelta
+    ).distinct(
+        subscribe_import_table.c.follower_username,
+        subscribe_import_table.c.followed_username
+    ).subquery("staged")
+
+    inserted = insert(Subscribe).from_select(
+        ["follower_id", "followed_id"],
+        select(follower.id, followed.id).join_from(
+            staged, follower, follower.username == staged.c.follower_username
+        ).join(
+            followed, followed.username == staged.c.followed_username
+        ).where(
+            follower.id != followed.id
+        )
+    ).on_conflict_do_nothing().returning(
+        Subscribe.id, Subscribe.follower_id, Subscribe.followed_id
+    ).cte("inserted")
+
+    statement = sa_insert(Notification).from_select(
+        ["subscription_id", "notification_time"],
+        select(
+            inserted.c.id,
+            next_notification_time(
+                birthday=followed.birthday,
+                notification_offset=staged.c.notification_timedelta,
+                now=datetime.now()
+            )
+        ).join_from(
+            inserted, follower, follower.id == inserted.c.follower_id
+        ).join(
+            followed, followed.id == inserted.c.followed_id
+        ).join(
+            staged,
+            (staged.c.follower_username == follower.username) &
+            (staged.c.followed_username == followed.username)
+        )
+    )
+    result = await connection.execute(statement)
+
+    return result.rowcount
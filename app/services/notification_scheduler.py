@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from array import array
+from datetime import datetime
+
+from app.constants.notification_constants import (
+    NOTIFICATION_SCHEDULER_WINDOW_SIZE, NOTIFICATION_SCHEDULER_LOW_WATERMARK,
+    NOTIFICATION_SCHEDULER_BATCH_SIZE, NOTIFICATION_SCHEDULER_RETRY_DELAY_SECONDS
+)
+from app.services.email_services import enqueue_birthday_emails
+from database import crud
+from database.core import AsyncSessionManager
+from database.query_stats import track_queries
+
+
+class NotificationScheduler:
+
+    def __init__(
+            self,
+            window_size: int,
+            low_watermark: int,
+            batch_size: int,
+            retry_delay: float
+    ):
+        self.window_size = window_size
+        self.low_watermark = low_watermark
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.enqueued = 0
+        self.refills = 0
+        self._times = array("d")
+        self._ids = array("q")
+        self._cancelled: set[int] = set()
+        self._cursor: tuple[datetime, int] | None = None
+        self._exhausted = False
+        self._resync_requested = True
+        self._refilling = False
+        self._deferred_events: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _push(self, moment: float, notification_id: int) -> None:
+        times, ids = self._times, self._ids
+        times.append(moment)
+        ids.append(notification_id)
+
+        position = len(times) - 1
+
+        while position > 0:
+            parent = (position - 1) >> 1
+
+            if times[parent] <= moment:
+                break
+
+            times[position], ids[position] = times[parent], ids[parent]
+            position = parent
+
+        times[position], ids[position] = moment, notification_id
+
+    def _pop(self) -> tuple[float, int]:
+        times, ids = self._times, self._ids
+        top = times[0], ids[0]
+
+        moment, notification_id = times.pop(), ids.pop()
+        size = len(times)
+
+        if size:
+            position = 0
+
+            while True:
+                child = 2 * position + 1
+
+                if child >= size:
+                    break
+
+                if child + 1 < size and times[child + 1] < times[child]:
+                    child += 1
+
+                if moment <= times[child]:
+                    break
+
+                times[position], ids[position] = times[child], ids[child]
+                position = child
+
+            times[position], ids[position] = moment, notification_id
+
+        return top
+
+    def _in_window(self, notification_time: datetime, notification_id: int) -> bool:
+        return self._exhausted or self._cursor is None or (notification_time, notification_id) <= self._cursor
+
+    def schedule(self, notification_id: int, notification_time: datetime) -> None:
+        self._cancelled.discard(notification_id)
+
+        if not self._in_window(notification_time, notification_id):
+            return
+
+        moment = notification_time.timestamp()
+        self._push(moment, notification_id)
+
+        if self._times[0] == moment:
+            self._wakeup.set()
+
+    def cancel(self, notification_id: int, notification_time: datetime) -> None:
+        if self._in_window(notification_time, notification_id):
+            self._cancelled.add(notification_id)
+
+    def handle_event(self, event: dict) -> None:
+        if self._refilling:
+            self._deferred_events.append(event)
+            return
+
+        if event["op"] == "resync":
+            self._resync_requested = True
+            self._wakeup.set()
+            return
+
+        notification_time = datetime.fromisoformat(event["notification_time"])
+
+        if event["op"] == "DELETE":
+            self.cancel(event["id"], notification_time)
+        else:
+            self.schedule(event["id"], notification_time)
+
+    @track_queries("notification_scheduler.refill")
+    async def refill(self) -> None:
+        self._refilling = True
+
+        try:
+            async with AsyncSessionManager() as session:
+                notifications = await crud.read_scheduled_notifications(
+                    session=session,
+                    limit=self.window_size,
+                    after=self._cursor
+                )
+
+            for notification in notifications:
+                self._push(notification.notification_time.timestamp(), notification.id)
+
+            if notifications:
+                self._cursor = (notifications[-1].notification_time, notifications[-1].id)
+
+            self._exhausted = len(notifications) < self.window_size
+            self.refills += 1
+        finally:
+            self._refilling = False
+            deferred_events, self._deferred_events = self._deferred_events, []
+
+            for event in deferred_events:
+                self.handle_event(event)
+
+    async def resync(self) -> None:
+        self._times = array("d")
+        self._ids = array("q")
+        self._cancelled.clear()
+        self._cursor = None
+        self._exhausted = False
+        self._resync_requested = False
+
+        await self.refill()
+
+    @track_queries("notify_about_birthday")
+    async def _dispatch(self) -> None:
+        while True:
+            enqueued = await enqueue_birthday_emails(batch_size=self.batch_size)
+            self.enqueued += enqueued
+
+            if enqueued < self.batch_size:
+                break
+
+    async def _tick(self) -> None:
+        self._wakeup.clear()
+
+        if self._resync_requested:
+            await self.resync()
+
+        if not self._exhausted and (
+                len(self._ids) < self.low_watermark or
+                (self._cursor is not None and self._times[0] > self._cursor[0].timestamp())
+        ):
+            await self.refill()
+
+        now = time.time()
+        due = []
+
+        while self._ids and self._times[0] <= now:
+            _, notification_id = self._pop()
+
+            if notification_id in self._cancelled:
+                self._cancelled.discard(notification_id)
+                continue
+
+            due.append(notification_id)
+
+        if due:
+
+            try:
+                await self._dispatch()
+            except Exception:
+                retry_at = time.time() + self.retry_delay
+
+                for notification_id in due:
+                    self._push(retry_at, notification_id)
+
+                raise
+
+            return
+
+        timeout = max(self._times[0] - now, 0) if self._ids else None
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+
+            try:
+                await self._tick()
+            except Exception as e:
+                logging.error(f"Ошибка планировщика уведомлений: {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "scheduled": len(self._ids),
+            "next_due": datetime.fromtimestamp(self._times[0]).isoformat() if self._ids else None,
+            "window_until": self._cursor[0].isoformat() if self._cursor is not None else None,
+            "exhausted": self._exhausted,
+            "cancelled": len(self._cancelled),
+            "deferred_events": len(self._deferred_events),
+            "enqueued": self.enqueued,
+            "refills": self.refills,
+        }
+
+
+notification_scheduler = NotificationScheduler(
+    window_size=NOTIFICATION_SCHEDULER_WINDOW_SIZE,
+    low_watermark=NOTIFICATION_SCHEDULER_LOW_WATERMARK,
+    batch_size=NOTIFICATION_SCHEDULER_BATCH_SIZE,
+    retry_delay=NOTIFICATION_SCHEDULER_RETRY_DELAY_SECONDS
+)
@@ -1,10 +1,31 @@
-from typing import Tuple
+import orjson
+from typing import Tuple, AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import principal_cache
 from app.core.security import create_access_token, create_refresh_token
+from app.constants.user_constants import USERS_STREAM_PARTITION_SIZE
+from database import crud
 
 
-async def create_tokens(user_id: int) -> Tuple[str, str]:
+async def create_tokens(session: AsyncSession, user_id: int) -> Tuple[str, str]:
     access_token = await create_access_token(sub=str(user_id))
-    refresh_token = await create_refresh_token(sub=str(user_id))
+    refresh_token = await create_refresh_token(session=session, sub=str(user_id))
 
     return access_token, refresh_token
+
+
+async def stream_users_ndjson() -> AsyncIterator[bytes]:
+    async for partition in crud.stream_list_of_users(partition_size=USERS_STREAM_PARTITION_SIZE):
+        yield b"".join(
+            orjson.dumps({"id": user.id, "username": user.username, "email": user.email}) + b"\n"
+            for user in partition
+        )
+
+
+def handle_subscription_event(event: dict) -> None:
+    if event["op"] == "resync":
+        principal_cache.clear()
+        return
+
+    principal_cache.invalidate(event["follower_id"], event["followed_id"])
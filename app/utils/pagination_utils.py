@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from app.exceptions.user_exceptions import InvalidPaginationCursor
+
+
+CURSOR_SEPARATOR = "_"
+
+
+def encode_cursor(moment: datetime, row_id: int) -> str:
+    return f"{moment.isoformat()}{CURSOR_SEPARATOR}{row_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        moment, row_id = cursor.rsplit(CURSOR_SEPARATOR, 1)
+        return datetime.fromisoformat(moment), int(row_id)
+    except ValueError:
+        raise InvalidPaginationCursor()
@@ -0,0 +1,6 @@
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def trusted_response(model: BaseModel) -> ORJSONResponse:
+    return ORJSONResponse(content=model.model_dump())
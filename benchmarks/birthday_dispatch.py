@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "benchmark@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.constants.notification_constants import NOTIFICATION_SCHEDULER_BATCH_SIZE
+from database import crud
+from database.core import AsyncSessionManager, engine
+from database.query_stats import count_queries
+
+
+FOLLOWING_PER_USER = 100
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO "user" (username, email, hashed_password, birthday)
+    SELECT :prefix || g, :prefix || g || '@example.com', 'x', DATE '1970-01-01' + (g * 7919) % 18250
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    WITH seeded AS (
+        SELECT id, row_number() OVER (ORDER BY id) AS position
+        FROM "user"
+        WHERE username LIKE :prefix || '%'
+    )
+    INSERT INTO subscribe (follower_id, followed_id)
+    SELECT follower.id, followed.id
+    FROM seeded AS follower
+    CROSS JOIN generate_series(1, :following) AS step
+    JOIN seeded AS followed ON followed.position = (follower.position + step - 1) % :users + 1
+    ORDER BY follower.id, step
+    LIMIT :notifications
+    """,
+    """
+    INSERT INTO notification (subscription_id, notification_time)
+    SELECT subscribe.id, now() - (subscribe.id % 1440) * INTERVAL '1 minute' - INTERVAL '1 minute'
+    FROM subscribe
+    JOIN "user" ON "user".id = subscribe.follower_id
+    WHERE "user".username LIKE :prefix || '%'
+    """,
+]
+
+
+async def _seed(session: AsyncSession, notifications: int) -> int:
+    parameters = {
+        "prefix": f"bd{uuid.uuid4().hex[:8]}_",
+        "users": max(FOLLOWING_PER_USER + 1, -(-notifications // FOLLOWING_PER_USER)),
+        "following": FOLLOWING_PER_USER,
+        "notifications": notifications,
+    }
+
+    for statement in SEED_STATEMENTS:
+        await session.execute(text(statement), parameters)
+
+    return await session.scalar(text("SELECT count(*) FROM notification WHERE notification_time <= now()"))
+
+
+async def _dispatch(session: AsyncSession, batch_size: int) -> dict:
+    cycles = 0
+    rows = 0
+    max_statements_per_cycle = 0
+
+    with count_queries() as stats:
+        started_at = time.perf_counter()
+
+        while True:
+
+            with count_queries() as cycle_stats:
+                enqueued = await crud.enqueue_due_birthday_emails(session=session, limit=batch_size)
+
+            cycles += 1
+            rows += enqueued
+            max_statements_per_cycle = max(max_statements_per_cycle, cycle_stats.statements)
+
+            if enqueued < batch_size:
+                break
+
+        elapsed = time.perf_counter() - started_at
+
+    return {
+        "cycles": cycles,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+        "statements_per_cycle": round(stats.statements / cycles, 2),
+        "max_statements_per_cycle": max_statements_per_cycle,
+        "db_time_ms": round(stats.db_time * 1000, 1),
+    }
+
+
+async def run(notifications: int, batch_size: int) -> dict:
+    try:
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+                due = await _seed(session, notifications)
+
+                report = {
+                    "seeded_notifications": notifications,
+                    "due_notifications": due,
+                    "batch_size": batch_size,
+                    **await _dispatch(session, batch_size),
+                }
+
+                await session.rollback()
+    finally:
+        await engine.dispose()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Постановка в очередь писем по наступившим уведомлениям о Днях Рождения: "
+                    "запросов за цикл и строк в секунду. Данные создаются в транзакции и откатываются."
+    )
+    parser.add_argument("--notifications", type=int, default=100_000, help="Количество наступивших уведомлений.")
+    parser.add_argument(
+        "--batch-size", type=int, default=NOTIFICATION_SCHEDULER_BATCH_SIZE, help="Размер пачки за один цикл."
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(notifications=args.notifications, batch_size=args.batch_size))
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "benchmark@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.cache import principal_cache
+from app.core.security import get_current_user, get_current_principal
+from database.core import AsyncSessionManager, engine
+from database.query_stats import count_queries
+
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO "user" (username, email, hashed_password, birthday)
+    SELECT :prefix || g, :prefix || g || '@example.com', 'x', DATE '1990-01-01' + g % 365
+    FROM generate_series(0, :followers) AS g
+    """,
+    """
+    INSERT INTO subscribe (follower_id, followed_id)
+    SELECT follower.id, followed.id
+    FROM "user" AS followed
+    JOIN "user" AS follower ON follower.username LIKE :prefix || '%' AND follower.id <> followed.id
+    WHERE followed.username = :prefix || '0'
+    """,
+    """
+    UPDATE "user" SET followers_count = :followers WHERE username = :prefix || '0'
+    """,
+]
+
+
+async def _seed(session: AsyncSession, followers: int) -> int:
+    prefix = f"bp{uuid.uuid4().hex[:8]}_"
+
+    for statement in SEED_STATEMENTS:
+        await session.execute(text(statement), {"prefix": prefix, "followers": followers})
+
+    return await session.scalar(text("SELECT id FROM \"user\" WHERE username = :username"), {"username": f"{prefix}0"})
+
+
+async def _measure(dependency, session: AsyncSession, user_id: int, iterations: int) -> dict:
+    with count_queries() as stats:
+        started_at = time.perf_counter()
+
+        for _ in range(iterations):
+            principal_cache.clear()
+            session.expunge_all()
+            await dependency(user_id=user_id, session=session)
+
+        elapsed = time.perf_counter() - started_at
+
+    return {
+        "ms_per_call": round(elapsed / iterations * 1000, 3),
+        "calls_per_second": round(iterations / elapsed),
+        "statements_per_call": stats.statements / iterations,
+    }
+
+
+async def run(followers: int, iterations: int) -> dict:
+    try:
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+                user_id = await _seed(session, followers)
+
+                report = {
+                    "followers": followers,
+                    "iterations": iterations,
+                    "get_current_user": await _measure(get_current_user, session, user_id, iterations),
+                    "get_current_principal": await _measure(get_current_principal, session, user_id, iterations),
+                }
+
+                await session.rollback()
+    finally:
+        principal_cache.clear()
+        await engine.dispose()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Сравнение полной (get_current_user) и облегченной (get_current_principal) загрузки "
+                    "пользователя с большим числом подписчиков. Данные создаются в транзакции и откатываются."
+    )
+    parser.add_argument("--followers", type=int, default=5000, help="Количество подписчиков у пользователя.")
+    parser.add_argument("--iterations", type=int, default=200, help="Количество вызовов каждой зависимости.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(followers=args.followers, iterations=args.iterations))
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
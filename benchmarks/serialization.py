@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "benchmark@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.schemas.user_schemas import ListUsersSchema, UserBaseSchema
+from app.utils.response_utils import trusted_response
+
+
+def _rows(users: int) -> list[dict]:
+    return [
+        {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com"}
+        for user_id in range(1, users + 1)
+    ]
+
+
+def _build_app(rows: list[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=ListUsersSchema, response_class=JSONResponse)
+    async def validated() -> ListUsersSchema:
+        return ListUsersSchema(users=[UserBaseSchema(**row) for row in rows])
+
+    @app.get("/trusted", response_model=ListUsersSchema)
+    async def trusted() -> ListUsersSchema:
+        return trusted_response(
+            ListUsersSchema.model_construct(
+                users=[UserBaseSchema.model_construct(**row) for row in rows],
+                next_after_id=None
+            )
+        )
+
+    return app
+
+
+async def _measure(client: httpx.AsyncClient, url: str, users: int, repeats: int) -> dict:
+    timings = []
+
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - started_at)
+
+        assert len(response.json()["users"]) == users
+
+    best = min(timings)
+
+    return {
+        "best_seconds": round(best, 3),
+        "users_per_second": round(users / best),
+        "response_bytes": len(response.content),
+    }
+
+
+async def run(users: int, repeats: int) -> dict:
+    transport = httpx.ASGITransport(app=_build_app(_rows(users)))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        validated = await _measure(client, "/validated", users, repeats)
+        trusted = await _measure(client, "/trusted", users, repeats)
+
+    return {
+        "users": users,
+        "repeats": repeats,
+        "validated_json_response": validated,
+        "model_construct_orjson_response": trusted,
+        "speedup": round(validated["best_seconds"] / trusted["best_seconds"], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Сериализация списка пользователей: валидируемые UserSchema с JSONResponse "
+                    "против model_construct с ORJSONResponse (trusted_response)."
+    )
+    parser.add_argument("--users", type=int, default=100_000, help="Количество пользователей в ответе.")
+    parser.add_argument("--repeats", type=int, default=3, help="Количество прогонов; в отчет идет лучший.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(users=args.users, repeats=args.repeats))
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
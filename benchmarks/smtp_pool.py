@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "benchmark@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+
+from app.core.smtp_pool import SMTPConnectionPool
+
+
+class LatencyHandler:
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.latency)
+        session.host_name = hostname
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, options):
+        await asyncio.sleep(self.latency)
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, options):
+        await asyncio.sleep(self.latency)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 OK"
+
+
+async def _send_with_new_client(config: ConnectionConfig, messages: int) -> None:
+    for _ in range(messages):
+        await FastMail(config).send_message(
+            MessageSchema(
+                subject="Benchmark",
+                recipients=["recipient@example.com"],
+                body="Benchmark",
+                subtype=MessageType.plain
+            )
+        )
+
+
+async def _send_with_pool(pool: SMTPConnectionPool, messages: int, concurrency: int) -> None:
+    for offset in range(0, messages, concurrency):
+        await asyncio.gather(
+            *(
+                pool.send(
+                    pool.build_message(
+                        text="Benchmark",
+                        subject="Benchmark",
+                        recipients=["recipient@example.com"],
+                        subtype=MessageType.plain.value
+                    )
+                )
+                for _ in range(min(concurrency, messages - offset))
+            )
+        )
+
+
+async def _measure(coroutine) -> float:
+    started_at = time.perf_counter()
+    await coroutine
+
+    return time.perf_counter() - started_at
+
+
+async def run(messages: int, concurrency: int, pool_size: int, port: int) -> dict:
+    config = ConnectionConfig(
+        MAIL_USERNAME="",
+        MAIL_PASSWORD="",
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=port,
+        MAIL_FROM="benchmark@example.com",
+        MAIL_FROM_NAME="Benchmark",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False
+    )
+    pool = SMTPConnectionPool(config=config, max_size=pool_size, max_idle=60)
+
+    try:
+        new_client = await _measure(_send_with_new_client(config, messages))
+        pooled = await _measure(_send_with_pool(pool, messages, 1))
+        pooled_concurrent = await _measure(_send_with_pool(pool, messages, concurrency))
+    finally:
+        await pool.close()
+
+    return {
+        "messages": messages,
+        "new_client_per_message": round(messages / new_client),
+        "pool_sequential": round(messages / pooled),
+        f"pool_concurrency_{concurrency}": round(messages / pooled_concurrent),
+        "pool": pool.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Сравнение отправки писем через новое SMTP-соединение и через пул (сообщений в секунду)."
+    )
+    parser.add_argument("--messages", type=int, default=500, help="Количество писем в каждом прогоне.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Размер пачки при параллельной отправке.")
+    parser.add_argument("--pool-size", type=int, default=4, help="Максимум соединений в пуле.")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Задержка aiosmtpd на каждую SMTP-команду.")
+    parser.add_argument("--port", type=int, default=8025, help="Порт локального aiosmtpd.")
+    args = parser.parse_args()
+
+    handler = LatencyHandler(latency=args.latency_ms / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=args.port)
+    controller.start()
+
+    try:
+        report = asyncio.run(
+            run(
+                messages=args.messages,
+                concurrency=args.concurrency,
+                pool_size=args.pool_size,
+                port=args.port
+            )
+        )
+    finally:
+        controller.stop()
+
+    report["received"] = handler.received
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "benchmark@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from database import statements
+from database.core import AsyncSessionManager, engine
+from database.models import User
+
+
+def _inline_user_base_by_id(user_id: int, username: str):
+    return select(User.id, User.username, User.email).filter_by(id=user_id), {}
+
+
+def _prebuilt_user_base_by_id(user_id: int, username: str):
+    return statements.USER_BASE_BY_ID, {"user_id": user_id}
+
+
+def _inline_user_by_username(user_id: int, username: str):
+    return select(User).filter_by(username=username), {}
+
+
+def _prebuilt_user_by_username(user_id: int, username: str):
+    return statements.USER_BY_USERNAME, {"username": username}
+
+
+QUERIES = {
+    "user_base_by_id": (_inline_user_base_by_id, _prebuilt_user_base_by_id),
+    "user_by_username": (_inline_user_by_username, _prebuilt_user_by_username),
+}
+
+
+async def _measure(session: AsyncSession, build, user_id: int, username: str, iterations: int) -> dict:
+    statement, params = build(user_id, username)
+    await session.execute(statement, params)
+
+    started_at = time.perf_counter()
+
+    for _ in range(iterations):
+        build(user_id, username)
+
+    built = time.perf_counter() - started_at
+    started_at = time.perf_counter()
+
+    for _ in range(iterations):
+        statement, params = build(user_id, username)
+        result = await session.execute(statement, params)
+        result.all()
+
+    executed = time.perf_counter() - started_at
+
+    return {
+        "build_us_per_call": round(built / iterations * 1_000_000, 2),
+        "execute_us_per_call": round(executed / iterations * 1_000_000, 2),
+    }
+
+
+async def run(iterations: int) -> dict:
+    username = f"bs{uuid.uuid4().hex[:8]}"
+    report = {"iterations": iterations}
+
+    try:
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+                user_id = await session.scalar(
+                    text(
+                        "INSERT INTO \"user\" (username, email, hashed_password, birthday) "
+                        "VALUES (:username, :email, 'x', DATE '1990-01-01') RETURNING id"
+                    ),
+                    {"username": username, "email": f"{username}@example.com"}
+                )
+
+                for name, (inline, prebuilt) in QUERIES.items():
+                    report[name] = {
+                        "inline": await _measure(session, inline, user_id, username, iterations),
+                        "prebuilt": await _measure(session, prebuilt, user_id, username, iterations),
+                    }
+
+                await session.rollback()
+    finally:
+        await engine.dispose()
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Накладные расходы на вызов: заранее собранные запросы из database/statements.py "
+                    "против select(), собираемого при каждом вызове, в одной сессии."
+    )
+    parser.add_argument("--iterations", type=int, default=5000, help="Количество вызовов каждого варианта.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(iterations=args.iterations))
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
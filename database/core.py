@@ -1,10 +1,45 @@
-from sqlalchemy.ext.asyncio import create_async_engine
+from typing import AsyncIterator, Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 
-from settings.loader import PG_CONNECTION_URL
+from database.query_stats import instrument_engine
+from settings.loader import (
+    PG_CONNECTION_URL, PG_REPLICA_CONNECTION_URL, REPLICA_CONNECT_TIMEOUT_SECONDS, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_QUERY_CACHE_SIZE, DB_PREPARED_STATEMENT_CACHE_SIZE
+)
+
+
+def _create_engine(url: str, connect_timeout: float | None = None) -> AsyncEngine:
+    connect_args = {
+        "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+    if connect_timeout is not None:
+        connect_args["timeout"] = connect_timeout
+
+    async_engine = create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        query_cache_size=DB_QUERY_CACHE_SIZE,
+        connect_args=connect_args
+    )
+    instrument_engine(async_engine)
 
+    return async_engine
 
-engine = create_async_engine(PG_CONNECTION_URL)
+
+engine = _create_engine(PG_CONNECTION_URL)
+
+replica_engine = _create_engine(
+    PG_REPLICA_CONNECTION_URL,
+    connect_timeout=REPLICA_CONNECT_TIMEOUT_SECONDS
+) if PG_REPLICA_CONNECTION_URL else None
 
 
 AsyncSessionManager = async_sessionmaker(
@@ -12,3 +47,35 @@ AsyncSessionManager = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False
 )
+
+ReplicaSessionManager = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if replica_engine is not None else None
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            yield session
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    event.listen(
+        session.sync_session,
+        "after_commit",
+        lambda _: callback(),
+        once=True
+    )
+
+
+def pool_stats(async_engine: AsyncEngine = engine) -> dict:
+    pool = async_engine.sync_engine.pool
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -1,395 +1,769 @@
+import asyncio
+import calendar
 import logging
 import time
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, delete
-from sqlalchemy.orm import joinedload
-from datetime import date, time, timedelta, datetime
-
-from database.core import AsyncSessionManager
-from database.models import TokenBlacklistOutstanding, User, Subscribe, Notification
+from sqlalchemy import Row
+from sqlalchemy import (
+    select, delete, update, func, case, or_, tuple_, literal, bindparam, any_,
+    Interval, BigInteger
+)
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta, datetime
+from typing import AsyncIterator, Sequence
+
+from app.core.cache import principal_cache
+from app.constants.token_constants import TOKEN_PURGE_BATCH_SIZE, TOKEN_PURGE_PAUSE_SECONDS
+from app.constants.user_constants import (
+    FOLLOW_OUTCOME_FOLLOWED, FOLLOW_OUTCOME_ALREADY_FOLLOWING,
+    FOLLOW_OUTCOME_NOT_FOUND, FOLLOW_OUTCOME_SELF
+)
+from app.constants.notification_constants import EMAIL_OUTBOX_STATUS_PENDING, EMAIL_OUTBOX_STATUS_SENDING
+from app.utils.pagination_utils import encode_cursor
+from database import statements
+from database.expressions import next_notification_time
+from database.core import AsyncSessionManager, on_commit
+from database.replica import replica_router
+from database.models import (
+    TokenBlacklistOutstanding, TokenBlacklisted, User, Subscribe, Notification, EmailOutbox
+)
+from app.exceptions.token_exceptions import TokenRevoked
 from app.exceptions.user_exceptions import (
     UserAlreadyExists, UserExistError, UnmatchedPassOrUsername,
     SubscriptionAlreadyExists, SubscriptionDoesNotExist
 )
 from app.schemas.user_schemas import (
     UserBaseSchema, UserSchema, ListUsersSchema,
-    UserNotificationsSchema, UserNotificationSchema, UserEmailSchema
+    UserNotificationsSchema, UserNotificationSchema,
+    UpcomingBirthdaysSchema, UpcomingBirthdaySchema
 )
 
 
-async def create_refresh_token(
-        token: str,
+async def create_refresh_tokens(
+        session: AsyncSession,
+        refresh_tokens: list[dict]
+) -> None:
+    statement = insert(TokenBlacklistOutstanding).values(
+        refresh_tokens
+    ).on_conflict_do_nothing(index_elements=[TokenBlacklistOutstanding.jti])
+    await session.execute(statement)
+
+
+async def create_blacklisted_token(
+        session: AsyncSession,
         exp: int,
         iat: int,
         jti: str,
         user_id: int
-) -> TokenBlacklistOutstanding:
-    async with AsyncSessionManager() as session:
-        async with session.begin():
-            refresh_token = TokenBlacklistOutstanding(
-                token=token,
-                exp=exp,
-                iat=iat,
-                jti=jti,
-                user_id=user_id
-            )
-            session.add(refresh_token)
-        await session.commit()
-
-        return refresh_token
-
-
-async def read_user_by_user_id(user_id: int) -> UserSchema:
-    async with AsyncSessionManager() as session:
-        statement = select(User).options(joinedload(User.followers), joinedload(User.following)).filter_by(id=user_id)
-        result = await session.execute(statement=statement)
-
-        user = result.scalars().first()
-
-        if user is None:
-            raise UserExistError()
-
-        user = UserSchema(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            followers=[
-                UserBaseSchema(
-                    id=follower.id,
-                    username=follower.username,
-                    email=follower.email
-                ) for follower in user.followers
-            ],
-            following=[
-                UserBaseSchema(
-                    id=followed.id,
-                    username=followed.username,
-                    email=followed.email
-                ) for followed in user.following
-            ],
-        )
-
-        return user
-
-
-async def read_user_email_by_user_id(user_id: int) -> UserEmailSchema:
-
-    async with AsyncSessionManager() as session:
-
-        statement = select(User).filter_by(id=user_id)
-        result = await session.execute(statement=statement)
-        user = result.scalars().first()
-
-        user = UserEmailSchema(
-            id=user.id,
-            email=user.email
-        )
-
-        return user
-
-
-async def read_user_by_username(username: str) -> User:
-    async with AsyncSessionManager() as session:
-        statement = select(User).filter_by(username=username)
-        result = await session.execute(statement=statement)
-
-        user = result.scalars().first()
+) -> None:
+    statement = insert(TokenBlacklistOutstanding).values(
+        exp=exp,
+        iat=iat,
+        jti=jti,
+        user_id=user_id
+    ).on_conflict_do_nothing(index_elements=[TokenBlacklistOutstanding.jti])
+    await session.execute(statement)
+
+    statement = insert(TokenBlacklisted).from_select(
+        ["token_id"],
+        select(TokenBlacklistOutstanding.id).where(TokenBlacklistOutstanding.jti == jti)
+    ).on_conflict_do_nothing(index_elements=[TokenBlacklisted.token_id]).returning(TokenBlacklisted.id)
+    result = await session.execute(statement)
+
+    if result.scalar_one_or_none() is None:
+        raise TokenRevoked()
+
+
+async def read_revoked_tokens(
+        session: AsyncSession,
+        since: datetime | None = None
+):
+    statement = select(
+        TokenBlacklistOutstanding.jti,
+        TokenBlacklistOutstanding.exp,
+        TokenBlacklisted.blacklisted_at
+    ).join(
+        TokenBlacklisted,
+        TokenBlacklisted.token_id == TokenBlacklistOutstanding.id
+    ).where(
+        TokenBlacklistOutstanding.exp >= int(time.time())
+    )
+
+    if since is not None:
+        statement = statement.where(TokenBlacklisted.blacklisted_at >= since)
+
+    result = await session.execute(statement)
+
+    return result.all()
+
+
+async def read_user_by_user_id(
+        session: AsyncSession,
+        user_id: int
+) -> UserSchema:
+    result = await session.execute(
+        statement=statements.USER_WITH_GRAPH_BY_ID,
+        params={"user_id": user_id}
+    )
+
+    user = result.unique().scalars().first()
+
+    if user is None:
+        raise UserExistError()
+
+    user = UserSchema.model_construct(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        followers_count=user.followers_count,
+        following_count=user.following_count,
+        followers=[
+            UserBaseSchema.model_construct(
+                id=follower.id,
+                username=follower.username,
+                email=follower.email
+            ) for follower in user.followers
+        ],
+        following=[
+            UserBaseSchema.model_construct(
+                id=followed.id,
+                username=followed.username,
+                email=followed.email
+            ) for followed in user.following
+        ],
+    )
+
+    return user
+
+
+async def read_user_base_by_user_id(
+        session: AsyncSession,
+        user_id: int
+) -> UserBaseSchema:
+    result = await session.execute(
+        statement=statements.USER_BASE_BY_ID,
+        params={"user_id": user_id}
+    )
 
-        if user is None:
-            raise UnmatchedPassOrUsername()
+    user = result.first()
 
-        return user
+    if user is None:
+        raise UserExistError()
 
+    user = UserBaseSchema.model_construct(
+        id=user.id,
+        username=user.username,
+        email=user.email
+    )
 
-async def read_list_of_users() -> ListUsersSchema:
-    async with AsyncSessionManager() as session:
-        statement = select(User).order_by(User.id)
-        result = await session.execute(statement=statement)
+    return user
 
-        users = result.scalars().all()
 
-        users = ListUsersSchema(
-            users=[
-                UserBaseSchema(
-                    id=user.id,
-                    username=user.username,
-                    email=user.email
-                ) for user in users
-            ]
-        )
+async def read_user_by_username(
+        session: AsyncSession,
+        username: str
+) -> User:
+    result = await session.execute(
+        statement=statements.USER_BY_USERNAME,
+        params={"username": username}
+    )
+
+    user = result.scalars().first()
+
+    if user is None:
+        raise UnmatchedPassOrUsername()
+
+    return user
+
+
+async def read_list_of_users(
+        session: AsyncSession,
+        limit: int,
+        after_id: int | None = None
+) -> ListUsersSchema:
+    statement = select(User.id, User.username, User.email).order_by(User.id).limit(limit + 1)
+
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+
+    result = await session.execute(statement=statement)
+
+    rows = result.all()
+
+    users = ListUsersSchema.model_construct(
+        users=[
+            UserBaseSchema.model_construct(
+                id=user.id,
+                username=user.username,
+                email=user.email
+            ) for user in rows[:limit]
+        ],
+        next_after_id=rows[limit - 1].id if len(rows) > limit else None
+    )
+
+    return users
+
+
+async def read_list_of_followers(
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        after_id: int | None = None
+) -> ListUsersSchema:
+    return await _read_subscription_page(
+        session=session,
+        user_column=Subscribe.followed_id,
+        other_column=Subscribe.follower_id,
+        user_id=user_id,
+        limit=limit,
+        after_id=after_id
+    )
+
+
+async def read_list_of_following(
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        after_id: int | None = None
+) -> ListUsersSchema:
+    return await _read_subscription_page(
+        session=session,
+        user_column=Subscribe.follower_id,
+        other_column=Subscribe.followed_id,
+        user_id=user_id,
+        limit=limit,
+        after_id=after_id
+    )
+
+
+async def _read_subscription_page(
+        session: AsyncSession,
+        user_column,
+        other_column,
+        user_id: int,
+        limit: int,
+        after_id: int | None
+) -> ListUsersSchema:
+    statement = select(User.id, User.username, User.email).join(
+        Subscribe, other_column == User.id
+    ).where(
+        user_column == user_id
+    ).order_by(User.id).limit(limit + 1)
+
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+
+    result = await session.execute(statement=statement)
+
+    rows = result.all()
+
+    users = ListUsersSchema.model_construct(
+        users=[
+            UserBaseSchema.model_construct(
+                id=user.id,
+                username=user.username,
+                email=user.email
+            ) for user in rows[:limit]
+        ],
+        next_after_id=rows[limit - 1].id if len(rows) > limit else None
+    )
+
+    return users
+
+
+async def stream_list_of_users(partition_size: int) -> AsyncIterator[Sequence[Row]]:
+    async with replica_router.session_maker()() as session:
+        async with session.begin():
+            statement = select(User.id, User.username, User.email).order_by(User.id).execution_options(
+                yield_per=partition_size
+            )
+            result = await session.stream(statement)
 
-        return users
+            async for partition in result.partitions():
+                yield partition
 
 
 async def create_user(
+        session: AsyncSession,
         username: str,
         email: str,
         hashed_password: str,
         birthday: date
 ) -> User:
 
-    async with AsyncSessionManager() as session:
-
-        try:
-
-            async with session.begin():
+    try:
 
-                user = User(
-                    username=username,
-                    email=email,
-                    hashed_password=hashed_password,
-                    birthday=birthday
-                )
-                session.add(user)
+        user = User(
+            username=username,
+            email=email,
+            hashed_password=hashed_password,
+            birthday=birthday
+        )
+        session.add(user)
 
-            await session.commit()
+        await session.flush()
 
-        except IntegrityError as e:
-            logging.error(f"Пользователь уже существует: {e}")
-            raise UserAlreadyExists()
+    except IntegrityError as e:
+        logging.error(f"Пользователь уже существует: {e}")
+        raise UserAlreadyExists()
 
-        return user
+    return user
 
 
 async def create_follow_user(
+        session: AsyncSession,
         current_user_id: int,
         following_user_id: int
 ) -> Subscribe:
 
-    async with AsyncSessionManager() as session:
+    following_user = await session.get(User, following_user_id)
 
-        try:
+    if following_user is None:
+        raise UserExistError()
 
-            async with session.begin():
+    try:
 
-                statement = select(User).filter_by(id=following_user_id)
-                result = await session.execute(statement=statement)
+        subscribe = Subscribe(
+            follower_id=current_user_id,
+            followed_id=following_user_id
+        )
+        session.add(subscribe)
 
-                following_user = result.scalars().first()
+        await session.flush()
 
-                if following_user is None:
-                    raise UserExistError()
+    except IntegrityError as e:
+        logging.error(f"Вы уже подписаны на данного пользователя!: {e}")
+        raise SubscriptionAlreadyExists()
 
-                subscribe = Subscribe(
-                    follower_id=current_user_id,
-                    followed_id=following_user_id
-                )
-                session.add(subscribe)
+    await _adjust_subscription_counts(
+        session=session,
+        follower_id=current_user_id,
+        followed_ids=[following_user_id],
+        delta=1
+    )
 
-            await session.commit()
+    on_commit(session, lambda: _on_subscription_changed(current_user_id, following_user_id))
 
-        except IntegrityError as e:
-            logging.error(f"Вы уже подписаны на данного пользователя!: {e}")
-            raise SubscriptionAlreadyExists()
-
-        return subscribe
+    return subscribe
 
 
 async def delete_follow_user(
+        session: AsyncSession,
         current_user_id: int,
         following_user_id: int
 ) -> None:
 
-    async with AsyncSessionManager() as session:
-
-        async with session.begin():
+    statement = delete(Subscribe).where(
+        Subscribe.follower_id == current_user_id,
+        Subscribe.followed_id == following_user_id
+    ).returning(Subscribe.id)
+    result = await session.execute(statement)
 
-            statement = select(Subscribe).filter_by(
-                follower_id=current_user_id,
-                followed_id=following_user_id
-            )
-            result = await session.execute(statement)
-            subscribe = result.scalars().first()
+    if result.first() is None:
+        raise SubscriptionDoesNotExist()
 
-            if subscribe is None:
-                raise SubscriptionDoesNotExist()
+    await _adjust_subscription_counts(
+        session=session,
+        follower_id=current_user_id,
+        followed_ids=[following_user_id],
+        delta=-1
+    )
 
-            await session.delete(subscribe)
+    on_commit(session, lambda: _on_subscription_changed(current_user_id, following_user_id))
 
-        await session.commit()
 
+async def create_bulk_follow_users(
+        session: AsyncSession,
+        current_user_id: int,
+        following_user_ids: list[int],
+        notification_timedelta: timedelta
+) -> dict[int, str]:
 
-async def delete_expired_tokens():
+    requested_ids = list(dict.fromkeys(following_user_ids))
+    candidate_ids = [user_id for user_id in requested_ids if user_id != current_user_id]
 
-    async with AsyncSessionManager() as session:
+    result = await session.execute(
+        select(User.id).where(
+            User.id == any_(bindparam("user_ids", candidate_ids, type_=ARRAY(BigInteger)))
+        )
+    )
+    existing_ids = set(result.scalars().all())
 
-        try:
-            async with session.begin():
+    followed_ids = set()
 
-                current_time = int(time.time())
+    if existing_ids:
 
-                statement = delete(TokenBlacklistOutstanding).where(
-                    TokenBlacklistOutstanding.exp < current_time
+        inserted = insert(Subscribe).from_select(
+            ["follower_id", "followed_id"],
+            select(
+                literal(current_user_id, BigInteger),
+                User.id
+            ).where(
+                User.id == any_(bindparam("user_ids", list(existing_ids), type_=ARRAY(BigInteger)))
+            )
+        ).on_conflict_do_nothing().returning(
+            Subscribe.id, Subscribe.followed_id
+        ).cte("inserted")
+
+        notified = insert(Notification).from_select(
+            ["subscription_id", "notification_time"],
+            select(
+                inserted.c.id,
+                next_notification_time(
+                    birthday=User.birthday,
+                    notification_offset=literal(notification_timedelta, Interval),
+                    now=datetime.now()
                 )
-                await session.execute(statement)
+            ).join_from(
+                inserted, User, User.id == inserted.c.followed_id
+            )
+        ).returning(Notification.subscription_id).cte("notified")
 
-            await session.commit()
+        result = await session.execute(
+            select(inserted.c.followed_id).join_from(
+                notified, inserted, inserted.c.id == notified.c.subscription_id
+            )
+        )
+        followed_ids = set(result.scalars().all())
 
-        except Exception as e:
-            logging.info(f"Ошибка очистки токенов: {e}")
+    if followed_ids:
 
+        await _adjust_subscription_counts(
+            session=session,
+            follower_id=current_user_id,
+            followed_ids=list(followed_ids),
+            delta=1
+        )
 
-async def create_notification(
-        subscription_id: int,
-        following_user_id: int,
-        notification_timedelta: timedelta
-) -> Notification:
+        on_commit(session, lambda: _on_subscription_changed(current_user_id, *followed_ids))
 
-    async with AsyncSessionManager() as session:
+    outcomes = {}
 
-        async with session.begin():
+    for user_id in requested_ids:
 
-            statement = select(User).filter_by(id=following_user_id)
-            result = await session.execute(statement=statement)
+        if user_id == current_user_id:
+            outcomes[user_id] = FOLLOW_OUTCOME_SELF
+        elif user_id not in existing_ids:
+            outcomes[user_id] = FOLLOW_OUTCOME_NOT_FOUND
+        elif user_id in followed_ids:
+            outcomes[user_id] = FOLLOW_OUTCOME_FOLLOWED
+        else:
+            outcomes[user_id] = FOLLOW_OUTCOME_ALREADY_FOLLOWING
 
-            following_user = result.scalars().first()
+    return outcomes
 
-            current_date = datetime.now()
 
-            following_user_birthday = datetime(
-                year=current_date.year,
-                month=following_user.birthday.month,
-                day=following_user.birthday.day
-            )
+async def _adjust_subscription_counts(
+        session: AsyncSession,
+        follower_id: int,
+        followed_ids: list[int],
+        delta: int
+) -> None:
 
-            notification_time = following_user_birthday - notification_timedelta
+    followed_ids_param = bindparam("followed_ids", followed_ids, type_=ARRAY(BigInteger))
 
-            if notification_time < current_date:
-                notification_time = notification_time.replace(year=current_date.year + 1)
+    statement = update(User).values(
+        following_count=User.following_count + case(
+            (User.id == follower_id, delta * len(followed_ids)),
+            else_=0
+        ),
+        followers_count=User.followers_count + case(
+            (User.id == any_(followed_ids_param), delta),
+            else_=0
+        )
+    ).where(
+        or_(User.id == follower_id, User.id == any_(followed_ids_param))
+    ).execution_options(synchronize_session=False)
 
-            notification = Notification(
-                subscription_id=subscription_id,
-                notification_time=notification_time,  # noqa
-            )
-            session.add(notification)
+    await session.execute(statement)
 
-        await session.commit()
 
-        return notification
+def _on_subscription_changed(follower_id: int, *followed_ids: int) -> None:
+    principal_cache.invalidate(follower_id, *followed_ids)
 
 
-async def read_subscribes_by_follower_id(follower_id: int):
+async def delete_expired_tokens(
+        batch_size: int = TOKEN_PURGE_BATCH_SIZE,
+        pause: float = TOKEN_PURGE_PAUSE_SECONDS
+) -> int:
 
-    async with AsyncSessionManager() as session:
+    current_time = int(time.time())
+    total_deleted = 0
+    batches = 0
 
-        async with session.begin():
+    while True:
 
-            statement = select(Subscribe).filter_by(
-                follower_id=follower_id
-            )
-            result = await session.execute(statement)
-            subscribes = result.scalars().all()
+        started_at = time.perf_counter()
 
-        return subscribes
+        try:
 
+            async with AsyncSessionManager() as session:
 
-async def read_subscribe_by_id(subscribe_id: int):
+                async with session.begin():
 
-    async with AsyncSessionManager() as session:
+                    expired_tokens = select(TokenBlacklistOutstanding.id).where(
+                        TokenBlacklistOutstanding.exp < current_time
+                    ).limit(batch_size)
 
-        async with session.begin():
+                    statement = delete(TokenBlacklistOutstanding).where(
+                        TokenBlacklistOutstanding.id == any_(func.array(expired_tokens.scalar_subquery()))
+                    )
+                    result = await session.execute(statement)
 
-            statement = select(Subscribe).filter_by(
-                id=subscribe_id
+        except Exception:
+            logging.exception(
+                f"Очистка токенов прервана ошибкой на пакете {batches + 1}: "
+                f"до ошибки удалено {total_deleted}, пакетов {batches}"
             )
-            result = await session.execute(statement)
-            subscribe = result.scalars().first()
+            return total_deleted
 
-        return subscribe
+        deleted = result.rowcount
+        total_deleted += deleted
+        batches += 1
 
+        logging.info(
+            f"Очистка токенов: пакет {batches}, удалено {deleted} "
+            f"за {(time.perf_counter() - started_at) * 1000:.1f} мс"
+        )
 
-async def read_notification_by_subscription_id(
-        subscription_id: int
-) -> Notification:
+        if deleted < batch_size:
+            break
 
-    async with AsyncSessionManager() as session:
+        await asyncio.sleep(pause)
+
+    logging.info(f"Очистка токенов завершена: удалено {total_deleted}, пакетов {batches}")
+
+    return total_deleted
 
-        async with session.begin():
 
-            statement = select(Notification).filter_by(
-                subscription_id=subscription_id
+async def create_notification(
+        session: AsyncSession,
+        subscription_id: int,
+        following_user_id: int,
+        notification_timedelta: timedelta
+) -> Notification:
+
+    statement = insert(Notification).from_select(
+        ["subscription_id", "notification_time"],
+        select(
+            literal(subscription_id, BigInteger),
+            next_notification_time(
+                birthday=User.birthday,
+                notification_offset=literal(notification_timedelta, Interval),
+                now=datetime.now()
             )
-            result = await session.execute(statement)
-            notification = result.scalars().first()
+        ).where(
+            User.id == following_user_id
+        )
+    ).returning(Notification)
+    result = await session.execute(statement)
 
-        return notification
+    return result.scalar_one()
 
 
 async def read_user_list_of_notifications(
-        user_id: int
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None
 ) -> UserNotificationsSchema:
 
-    async with AsyncSessionManager() as session:
+    statement = select(
+        Notification.id,
+        Notification.notification_time,
+        User.id.label("user_id"),
+        User.username,
+        User.email
+    ).join(
+        Subscribe, Subscribe.id == Notification.subscription_id
+    ).join(
+        User, User.id == Subscribe.followed_id
+    ).where(
+        Subscribe.follower_id == user_id
+    ).order_by(
+        Notification.notification_time, Notification.id
+    ).limit(limit + 1)
+
+    if after is not None:
+        statement = statement.where(
+            tuple_(Notification.notification_time, Notification.id) > tuple_(*after)
+        )
 
-        async with session.begin():
+    result = await session.execute(statement)
+    rows = result.all()
+
+    user_notifications = UserNotificationsSchema.model_construct(
+        notifications=[
+            UserNotificationSchema.model_construct(
+                notification_time=row.notification_time,
+                user=UserBaseSchema.model_construct(
+                    id=row.user_id,
+                    username=row.username,
+                    email=row.email
+                )
+            ) for row in rows[:limit]
+        ]
+    )
+
+    if len(rows) > limit:
+        last_row = rows[limit - 1]
+        user_notifications.next_cursor = encode_cursor(last_row.notification_time, last_row.id)
+
+    return user_notifications
+
+
+async def read_upcoming_birthdays(
+        session: AsyncSession,
+        user_id: int,
+        days: int,
+        only_following: bool,
+        limit: int
+) -> UpcomingBirthdaysSchema:
+
+    today = date.today()
+    last_day = today + timedelta(days=days)
+
+    start = today.month * 100 + today.day
+    end = last_day.month * 100 + last_day.day
+
+    if end == 228 and not calendar.isleap(last_day.year):
+        end = 229
+
+    if last_day.year == today.year:
+        in_range = User.birthday_month_day.between(start, end)
+    else:
+        in_range = or_(User.birthday_month_day >= start, User.birthday_month_day <= end)
+
+    statement = select(
+        User.id, User.username, User.email, User.birthday, User.birthday_month_day
+    ).where(
+        in_range,
+        User.id != user_id
+    ).order_by(
+        User.birthday_month_day < start, User.birthday_month_day, User.id
+    ).limit(limit)
+
+    if only_following:
+        statement = statement.join(
+            Subscribe, Subscribe.followed_id == User.id
+        ).where(
+            Subscribe.follower_id == user_id
+        )
 
-            user_notifications = UserNotificationsSchema(
-                notifications=[]
-            )
+    result = await session.execute(statement)
+
+    birthdays = UpcomingBirthdaysSchema.model_construct(
+        birthdays=[
+            UpcomingBirthdaySchema.model_construct(
+                user=UserBaseSchema.model_construct(
+                    id=row.id,
+                    username=row.username,
+                    email=row.email
+                ),
+                birthday=row.birthday,
+                next_birthday=_next_birthday(
+                    row.birthday,
+                    today.year if row.birthday_month_day >= start else today.year + 1
+                )
+            ) for row in result.all()
+        ]
+    )
 
-            subscribes = await read_subscribes_by_follower_id(follower_id=user_id)
+    return birthdays
 
-            for subscribe in subscribes:
 
-                notification = await read_notification_by_subscription_id(subscription_id=subscribe.id)
+def _next_birthday(birthday: date, year: int) -> date:
+    if birthday.month == 2 and birthday.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
 
-                statement = select(User).filter_by(
-                    id=subscribe.followed_id
-                )
-                result = await session.execute(statement)
-                user = result.scalars().first()
+    return birthday.replace(year=year)
 
-                user = UserBaseSchema(
-                    id=user.id,
-                    username=user.username,
-                    email=user.email
-                )
 
-                user_notification = UserNotificationSchema(
-                    notification_time=notification.notification_time,
-                    user=user
-                )
+async def read_scheduled_notifications(
+        session: AsyncSession,
+        limit: int,
+        after: tuple[datetime, int] | None = None
+) -> Sequence[Row]:
 
-                user_notifications.notifications.append(user_notification)
+    statement = select(
+        Notification.id, Notification.notification_time
+    ).order_by(
+        Notification.notification_time, Notification.id
+    ).limit(limit)
 
-        return user_notifications
+    if after is not None:
+        statement = statement.where(
+            tuple_(Notification.notification_time, Notification.id) > tuple_(*after)
+        )
 
+    result = await session.execute(statement)
 
-async def read_list_of_notifications_to_send_email():
+    return result.all()
 
-    async with AsyncSessionManager() as session:
 
-        async with session.begin():
+async def enqueue_due_birthday_emails(
+        session: AsyncSession,
+        limit: int
+) -> int:
 
-            current_time = datetime.now()
-            statement = select(Notification).where(
-                Notification.notification_time < current_time
-            )
-            result = await session.execute(statement)
-            notifications = result.scalars().all()
+    result = await session.execute(
+        statement=statements.ENQUEUE_DUE_BIRTHDAY_EMAILS,
+        params={"current_time": datetime.now(), "limit": limit}
+    )
 
-        return notifications
+    return result.rowcount
 
 
-async def update_notification_time_by_id(notification_id: int):
+async def claim_pending_emails(
+        session: AsyncSession,
+        limit: int,
+        leased_until: datetime,
+        max_attempts: int
+) -> Sequence[Row]:
 
-    async with AsyncSessionManager() as session:
+    result = await session.execute(
+        statement=statements.CLAIM_PENDING_EMAILS,
+        params={
+            "current_time": datetime.now(),
+            "limit": limit,
+            "leased_until": leased_until,
+            "max_attempts": max_attempts,
+        }
+    )
 
-        async with session.begin():
+    return result.all()
 
-            statement = select(Notification).filter_by(id=notification_id)
-            result = await session.execute(statement)
-            notification = result.scalars().first()
 
-            if notification is not None:
+async def delete_sent_emails(
+        session: AsyncSession,
+        email_ids: list[int]
+) -> None:
+
+    statement = delete(EmailOutbox).where(
+        EmailOutbox.id == any_(bindparam("email_ids", email_ids, type_=ARRAY(BigInteger)))
+    )
+    await session.execute(statement)
+
+
+async def update_failed_emails(
+        session: AsyncSession,
+        failed_emails: list[dict],
+        leased_until: datetime
+) -> None:
 
-                notification_time = notification.notification_time
+    statement = update(EmailOutbox).where(
+        EmailOutbox.status == EMAIL_OUTBOX_STATUS_SENDING,
+        EmailOutbox.next_attempt_at == leased_until
+    ).execution_options(synchronize_session=None)
+    await session.execute(statement, failed_emails)
 
-                new_notification_time = notification_time.replace(
-                    year=notification_time.year + 1)
 
-                notification.notification_time = new_notification_time
+async def read_next_email_attempt_at(session: AsyncSession) -> datetime | None:
 
-                await session.commit()
+    statement = select(func.min(EmailOutbox.next_attempt_at)).where(
+        EmailOutbox.status.in_([EMAIL_OUTBOX_STATUS_PENDING, EMAIL_OUTBOX_STATUS_SENDING])
+    )
+    result = await session.execute(statement)
 
-        return notification
+    return result.scalar()
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import ColumnElement, Integer, Interval, DateTime, case, cast, extract, func, literal
+
+
+def next_notification_time(
+        birthday: ColumnElement,
+        notification_offset: ColumnElement,
+        now: datetime
+) -> ColumnElement:
+    current_time = literal(now, DateTime)
+    years = cast(extract("year", current_time) - extract("year", birthday), Integer)
+
+    this_year = birthday + func.make_interval(years, type_=Interval) - notification_offset
+    next_year = birthday + func.make_interval(years + 1, type_=Interval) - notification_offset
+
+    return case(
+        (this_year >= current_time, this_year),
+        else_=next_year
+    )
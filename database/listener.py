@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from typing import Callable
+import asyncpg
+from sqlalchemy import make_url
+
+from app.constants.notification_constants import (
+    DATABASE_LISTENER_RECONNECT_SECONDS, DATABASE_LISTENER_KEEPALIVE_SECONDS
+)
+from settings.loader import PG_CONNECTION_URL
+
+
+class DatabaseListener:
+
+    def __init__(self, dsn: str, reconnect_delay: float, keepalive: float):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.keepalive = keepalive
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+        self._handlers: dict[str, list[Callable[[dict], None]]] = {}
+        self._task: asyncio.Task | None = None
+
+    def listen(self, channel: str, handler: Callable[[dict], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def _dispatch(self, channel: str, event: dict) -> None:
+        for handler in self._handlers.get(channel, []):
+
+            try:
+                handler(event)
+            except Exception as e:
+                logging.error(f"Ошибка обработки события {channel}: {e}")
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.received += 1
+        self._dispatch(channel, json.loads(payload))
+
+    async def _serve(self, connection: asyncpg.Connection) -> None:
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._on_notification)
+
+        self.connected = True
+
+        for channel in self._handlers:
+            self._dispatch(channel, {"op": "resync"})
+
+        while not lost.is_set():
+
+            try:
+                await asyncio.wait_for(lost.wait(), timeout=self.keepalive)
+            except asyncio.TimeoutError:
+                await connection.execute("SELECT 1")
+
+    async def _run(self) -> None:
+        while True:
+
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except Exception as e:
+                logging.error(f"Не удалось подключиться для LISTEN: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            try:
+                await self._serve(connection)
+            except Exception as e:
+                logging.error(f"Соединение LISTEN потеряно: {e}")
+            finally:
+                self.connected = False
+                connection.terminate()
+
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "channels": list(self._handlers),
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+
+database_listener = DatabaseListener(
+    dsn=make_url(PG_CONNECTION_URL).set(drivername="postgresql").render_as_string(hide_password=False),
+    reconnect_delay=DATABASE_LISTENER_RECONNECT_SECONDS,
+    keepalive=DATABASE_LISTENER_KEEPALIVE_SECONDS
+)
@@ -1,7 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql.functions import func
-from sqlalchemy import BigInteger, String, DateTime, ForeignKey, UniqueConstraint, Date
+from sqlalchemy import (
+    BigInteger, SmallInteger, String, DateTime, ForeignKey, UniqueConstraint, Date, Computed, Index, text
+)
 from datetime import datetime, date
 from pydantic import EmailStr
 
@@ -37,6 +39,22 @@ class User(Base):
     birthday: Mapped[date] = mapped_column(
         Date
     )
+    birthday_month_day: Mapped[int] = mapped_column(
+        SmallInteger,
+        Computed(
+            "(EXTRACT(MONTH FROM birthday) * 100 + EXTRACT(DAY FROM birthday))::smallint",
+            persisted=True
+        ),
+        index=True
+    )
+    followers_count: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default="0"
+    )
+    following_count: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default="0"
+    )
 
     followers: Mapped[list["User"]] = relationship(
         "User",
@@ -66,7 +84,8 @@ class Subscribe(Base):
         ForeignKey(
             "user.id",
             ondelete="CASCADE"
-        )
+        ),
+        index=True
     )
 
     __table_args__ = (
@@ -98,7 +117,8 @@ class Notification(Base):
     )
     notification_time: Mapped[DateTime] = mapped_column(
         DateTime,
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     subscription: Mapped["Subscribe"] = relationship(
@@ -114,10 +134,12 @@ class TokenBlacklistOutstanding(Base):
         BigInteger,
         primary_key=True
     )
-    token: Mapped[str]
-    exp: Mapped[int]
+    exp: Mapped[int] = mapped_column(index=True)
     iat: Mapped[int]
-    jti: Mapped[str]
+    jti: Mapped[str] = mapped_column(
+        unique=True,
+        index=True
+    )
     user_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey(
@@ -141,17 +163,56 @@ class TokenBlacklisted(Base):
     )
     blacklisted_at: Mapped[datetime] = mapped_column(
         DateTime,
-        server_default=func.now()
+        server_default=func.now(),
+        index=True
     )
     token_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey(
             "token_blacklist_outstanding.id",
             ondelete="CASCADE"
-        )
+        ),
+        unique=True,
+        index=True
     )
 
     outstanding_token: Mapped["TokenBlacklistOutstanding"] = relationship(
         "TokenBlacklistOutstanding",
         back_populates="blacklisted_tokens"
     )
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True
+    )
+    recipient: Mapped[str] = mapped_column(String)
+    subject: Mapped[str] = mapped_column(String)
+    body: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(
+        String(16),
+        server_default="pending"
+    )
+    attempts: Mapped[int] = mapped_column(
+        server_default="0"
+    )
+    last_error: Mapped[str | None] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now()
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_due_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('pending', 'sending')")
+        ),
+    )
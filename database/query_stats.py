@@ -0,0 +1,100 @@
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryStats:
+    def __init__(self, parent: "QueryStats | None" = None):
+        self.statements = 0
+        self.checkouts = 0
+        self.db_time = 0.0
+        self.parent = parent
+
+    def as_headers(self) -> dict[str, str]:
+        return {
+            "X-DB-Statements": str(self.statements),
+            "X-DB-Checkouts": str(self.checkouts),
+            "X-DB-Time-Ms": f"{self.db_time * 1000:.1f}",
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"запросов {self.statements}, соединений {self.checkouts}, "
+            f"время в БД {self.db_time * 1000:.1f} мс"
+        )
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def track_queries(name: str) -> Callable:
+    def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with count_queries() as stats:
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    logging.debug(f"БД [{name}]: {stats}")
+
+        return wrapper
+
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+
+    if stats is not None:
+        context.query_started_at = time.perf_counter()
+
+    while stats is not None:
+        stats.statements += 1
+        stats = stats.parent
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started_at = getattr(context, "query_started_at", None)
+
+    if started_at is None:
+        return
+
+    elapsed = time.perf_counter() - started_at
+
+    while stats is not None:
+        stats.db_time += elapsed
+        stats = stats.parent
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    stats = _current_stats.get()
+
+    while stats is not None:
+        stats.checkouts += 1
+        stats = stats.parent
+
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    sync_engine = async_engine.sync_engine
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "checkout", _checkout)
@@ -0,0 +1,117 @@
+import logging
+import time
+from typing import Callable
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from settings.loader import REPLICA_MAX_LAG_SECONDS, REPLICA_STICKINESS_SECONDS
+from database.core import AsyncSessionManager, ReplicaSessionManager, replica_engine, pool_stats
+
+
+REPLICA_LAG_STATEMENT = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+    "END"
+)
+
+
+class ReplicaRouter:
+
+    def __init__(self, max_lag: float, stickiness: float):
+        self.max_lag = max_lag
+        self.stickiness = stickiness
+        self.healthy = False
+        self.lag: float | None = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+
+    @property
+    def configured(self) -> bool:
+        return ReplicaSessionManager is not None
+
+    def is_sticky(self, last_write_at: str | None) -> bool:
+        if last_write_at is None:
+            return False
+
+        try:
+            elapsed = time.time() - float(last_write_at)
+        except ValueError:
+            return False
+
+        return 0 <= elapsed < self.stickiness
+
+    def is_replica(self, session: AsyncSession) -> bool:
+        return replica_engine is not None and session.bind is replica_engine
+
+    def mark_unhealthy(self, reason: Exception) -> None:
+        if self.healthy:
+            logging.warning(f"Реплика недоступна, чтение переключено на основную БД: {reason}")
+
+        self.healthy = False
+
+    def fall_back(self, reason: Exception) -> None:
+        self.fallback_reads += 1
+        self.mark_unhealthy(reason)
+
+    def use_replica(self, last_write_at: str | None = None) -> bool:
+        if not self.configured or not self.healthy:
+            self.primary_reads += 1
+            return False
+
+        if self.is_sticky(last_write_at):
+            self.primary_reads += 1
+            self.sticky_reads += 1
+            return False
+
+        self.replica_reads += 1
+
+        return True
+
+    def session_maker(self, last_write_at: str | None = None) -> Callable[[], AsyncSession]:
+        return ReplicaSessionManager if self.use_replica(last_write_at) else AsyncSessionManager
+
+    async def check_health(self) -> None:
+        if not self.configured:
+            return
+
+        try:
+            async with ReplicaSessionManager() as session:
+                result = await session.execute(REPLICA_LAG_STATEMENT)
+                lag = result.scalar()
+        except Exception as e:
+            self.lag = None
+            self.mark_unhealthy(e)
+            return
+
+        self.lag = float(lag) if lag is not None else None
+
+        if self.lag is None or self.lag > self.max_lag:
+            self.mark_unhealthy(Exception(f"отставание реплики {self.lag} с"))
+            return
+
+        if not self.healthy:
+            logging.info("Реплика доступна, чтение направляется на реплику")
+
+        self.healthy = True
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.configured,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+            "pool": pool_stats(replica_engine) if replica_engine is not None else None,
+        }
+
+
+replica_router = ReplicaRouter(
+    max_lag=REPLICA_MAX_LAG_SECONDS,
+    stickiness=REPLICA_STICKINESS_SECONDS
+)
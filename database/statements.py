@@ -0,0 +1,137 @@
+from sqlalchemy import select, insert, update, func, case, and_, bindparam, literal, literal_column, Interval, String
+from sqlalchemy.orm import selectinload, aliased
+
+from app.constants.notification_constants import (
+    BIRTHDAY_EMAIL_SUBJECT, BIRTHDAY_EMAIL_TEMPLATE, EMAIL_OUTBOX_STATUS_PENDING, EMAIL_OUTBOX_STATUS_SENDING,
+    EMAIL_OUTBOX_STATUS_DEAD, EMAIL_OUTBOX_LEASE_EXPIRED_ERROR
+)
+from database.models import User, Subscribe, Notification, EmailOutbox
+
+
+_follower = aliased(User)
+_followed = aliased(User)
+
+
+USER_WITH_GRAPH_BY_ID = select(User).options(
+    selectinload(User.followers),
+    selectinload(User.following)
+).where(
+    User.id == bindparam("user_id")
+)
+
+USER_BASE_BY_ID = select(
+    User.id, User.username, User.email
+).where(
+    User.id == bindparam("user_id")
+)
+
+USER_BY_USERNAME = select(User).where(
+    User.username == bindparam("username")
+)
+
+_claimed_notifications = select(
+    Notification.id,
+    _follower.email.label("recipient_email"),
+    _followed.email.label("birthday_user_email")
+).join(
+    Subscribe, Subscribe.id == Notification.subscription_id
+).join(
+    _follower, _follower.id == Subscribe.follower_id
+).join(
+    _followed, _followed.id == Subscribe.followed_id
+).where(
+    Notification.notification_time <= bindparam("current_time")
+).order_by(
+    Notification.notification_time
+).limit(
+    bindparam("limit")
+).with_for_update(
+    of=Notification,
+    skip_locked=True
+).cte("claimed")
+
+_advanced_notifications = update(Notification).where(
+    Notification.id == _claimed_notifications.c.id
+).values(
+    notification_time=Notification.notification_time + literal_column("interval '1 year'", Interval)
+).returning(Notification.id).cte("advanced")
+
+ENQUEUE_DUE_BIRTHDAY_EMAILS = insert(EmailOutbox.__table__).from_select(
+    ["recipient", "subject", "body"],
+    select(
+        _claimed_notifications.c.recipient_email,
+        literal(BIRTHDAY_EMAIL_SUBJECT, String),
+        func.format(literal(BIRTHDAY_EMAIL_TEMPLATE, String), _claimed_notifications.c.birthday_user_email)
+    )
+).add_cte(_advanced_notifications)
+
+_claimable_emails = select(
+    EmailOutbox.id
+).where(
+    EmailOutbox.status.in_([EMAIL_OUTBOX_STATUS_PENDING, EMAIL_OUTBOX_STATUS_SENDING]),
+    EmailOutbox.next_attempt_at <= bindparam("current_time")
+).order_by(
+    EmailOutbox.next_attempt_at
+).limit(
+    bindparam("limit")
+).with_for_update(
+    skip_locked=True
+).cte("claimable")
+
+_email_outbox = EmailOutbox.__table__
+
+_lease_expired = _email_outbox.c.status == EMAIL_OUTBOX_STATUS_SENDING
+
+_attempts_exhausted = and_(_lease_expired, _email_outbox.c.attempts >= bindparam("max_attempts"))
+
+CLAIM_PENDING_EMAILS = update(_email_outbox).where(
+    _email_outbox.c.id == _claimable_emails.c.id
+).values(
+    status=case(
+        (_attempts_exhausted, EMAIL_OUTBOX_STATUS_DEAD),
+        else_=EMAIL_OUTBOX_STATUS_SENDING
+    ),
+    attempts=case(
+        (_attempts_exhausted, _email_outbox.c.attempts),
+        else_=_email_outbox.c.attempts + 1
+    ),
+    next_attempt_at=case(
+        (_attempts_exhausted, _email_outbox.c.next_attempt_at),
+        else_=bindparam("leased_until")
+    ),
+    last_error=case(
+        (_lease_expired, literal(EMAIL_OUTBOX_LEASE_EXPIRED_ERROR, String)),
+        else_=_email_outbox.c.last_error
+    )
+).returning(
+    _email_outbox.c.id,
+    _email_outbox.c.recipient,
+    _email_outbox.c.subject,
+    _email_outbox.c.body,
+    _email_outbox.c.attempts,
+    _email_outbox.c.status
+)
+
+_followers_counts = select(
+    Subscribe.followed_id.label("user_id"),
+    func.count().label("total")
+).group_by(Subscribe.followed_id).subquery("followers_counts")
+
+_following_counts = select(
+    Subscribe.follower_id.label("user_id"),
+    func.count().label("total")
+).group_by(Subscribe.follower_id).subquery("following_counts")
+
+RECOUNT_FOLLOWERS = update(User).values(
+    followers_count=_followers_counts.c.total
+).where(
+    User.id == _followers_counts.c.user_id,
+    User.followers_count != _followers_counts.c.total
+)
+
+RECOUNT_FOLLOWING = update(User).values(
+    following_count=_following_counts.c.total
+).where(
+    User.id == _following_counts.c.user_id,
+    User.following_count != _following_counts.c.total
+)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from sqlalchemy.exc import IntegrityError
+
+from app.constants.token_constants import (
+    TOKEN_LEDGER_FLUSH_INTERVAL_SECONDS, TOKEN_LEDGER_BATCH_SIZE,
+    TOKEN_LEDGER_SHUTDOWN_RETRIES, TOKEN_LEDGER_MAX_BUFFER_SIZE
+)
+from database import crud
+from database.core import AsyncSessionManager
+
+
+class RefreshTokenLedger:
+
+    def __init__(self, flush_interval: float, batch_size: int, shutdown_retries: int, max_buffer_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.shutdown_retries = shutdown_retries
+        self.max_buffer_size = max_buffer_size
+        self.flushed_rows = 0
+        self.flushes = 0
+        self.rejected_rows = 0
+        self.dropped_rows = 0
+        self._buffer: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def add(self, exp: int, iat: int, jti: str, user_id: int) -> None:
+        if len(self._buffer) >= self.max_buffer_size:
+            self.dropped_rows += 1
+
+            if self.dropped_rows == 1 or self.dropped_rows % self.batch_size == 0:
+                logging.error(f"Буфер рефреш-токенов переполнен, отброшено строк: {self.dropped_rows}")
+
+            return
+
+        self._buffer.append({
+            "exp": exp,
+            "iat": iat,
+            "jti": jti,
+            "user_id": user_id,
+        })
+
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._lock:
+
+            while self._buffer:
+                rows = self._buffer[:self.batch_size]
+
+                try:
+                    async with AsyncSessionManager() as session:
+                        async with session.begin():
+                            await crud.create_refresh_tokens(session=session, refresh_tokens=rows)
+                except IntegrityError:
+                    await self._flush_rows_one_by_one(rows)
+
+                del self._buffer[:len(rows)]
+                self.flushed_rows += len(rows)
+                self.flushes += 1
+
+    async def _flush_rows_one_by_one(self, rows: list[dict]) -> None:
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+
+                for row in rows:
+
+                    try:
+                        async with session.begin_nested():
+                            await crud.create_refresh_tokens(session=session, refresh_tokens=[row])
+                    except IntegrityError as e:
+                        self.rejected_rows += 1
+                        logging.error(f"Рефреш-токен {row['jti']} пользователя {row['user_id']} не сохранен: {e.orig}")
+
+    async def _run(self) -> None:
+        while True:
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.error(f"Ошибка записи рефреш-токенов ({len(self._buffer)} в буфере): {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        for attempt in range(1, self.shutdown_retries + 1):
+
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                logging.error(f"Ошибка записи рефреш-токенов при остановке (попытка {attempt}): {e}")
+                await asyncio.sleep(self.flush_interval * attempt)
+
+        logging.critical(f"Не удалось сохранить {len(self._buffer)} рефреш-токенов при остановке")
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "flushed_rows": self.flushed_rows,
+            "flushes": self.flushes,
+            "rejected_rows": self.rejected_rows,
+            "dropped_rows": self.dropped_rows,
+        }
+
+
+refresh_token_ledger = RefreshTokenLedger(
+    flush_interval=TOKEN_LEDGER_FLUSH_INTERVAL_SECONDS,
+    batch_size=TOKEN_LEDGER_BATCH_SIZE,
+    shutdown_retries=TOKEN_LEDGER_SHUTDOWN_RETRIES,
+    max_buffer_size=TOKEN_LEDGER_MAX_BUFFER_SIZE
+)
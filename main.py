@@ -1,14 +1,59 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 import logging
+import math
+import time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.api.v1.user_router import router as user_router
+from app.api.v1.service_router import router as service_router
+from app.api.v1.token_router import router as token_router
 from database import crud
-from app.services.email_services import notify_about_birthday
+from app.services.notification_scheduler import notification_scheduler
+from app.services.email_outbox import email_outbox_sender
+from app.services.user_services import handle_subscription_event
+from app.core.hashing import password_hasher
+from app.core.smtp_pool import smtp_pool
+from app.core.revocation import revoked_tokens
+from database.token_ledger import refresh_token_ledger
+from database.replica import replica_router
+from database.listener import database_listener
+from database.query_stats import count_queries, track_queries
+from settings.loader import DB_QUERY_STATS_HEADERS, REPLICA_STICKINESS_SECONDS
+from app.constants.token_constants import REVOCATION_SYNC_INTERVAL_SECONDS, TOKEN_PURGE_INTERVAL_MINUTES
+from app.constants.service_constants import (
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS, REPLICA_LAST_WRITE_COOKIE, REPLICA_WRITE_METHODS
+)
+from app.constants.notification_constants import NOTIFICATION_CHANNEL, SUBSCRIPTION_CHANNEL, EMAIL_OUTBOX_CHANNEL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await replica_router.check_health()
+    await revoked_tokens.load()
+    refresh_token_ledger.start()
+    database_listener.listen(NOTIFICATION_CHANNEL, notification_scheduler.handle_event)
+    database_listener.listen(SUBSCRIPTION_CHANNEL, handle_subscription_event)
+    database_listener.listen(EMAIL_OUTBOX_CHANNEL, email_outbox_sender.handle_event)
+    database_listener.start()
+    notification_scheduler.start()
+    email_outbox_sender.start()
+    scheduler.start()
+    yield
+    scheduler.shutdown(wait=False)
+    await email_outbox_sender.stop()
+    await smtp_pool.close()
+    await notification_scheduler.stop()
+    await database_listener.stop()
+    await refresh_token_ledger.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title="Документация API для тестового задания.",
     version="0.0.1",
     docs_url="/",
@@ -16,10 +61,44 @@ app = FastAPI(
     description="Докуменатция составлена в рамках задания. Для связи: pozitif0898@gmail.com, +79814063284"
 )
 app.include_router(router=user_router)
+app.include_router(router=token_router)
+app.include_router(router=service_router)
 origins = [
     "http://0.0.0.0:8000",
     "http://127.0.0.1:8000"
 ]
+
+
+@app.middleware("http")
+async def db_query_stats(request: Request, call_next):
+    with count_queries() as stats:
+        response = await call_next(request)
+
+        logging.debug(f"БД [{request.method} {request.url.path}]: {stats}")
+
+        if DB_QUERY_STATS_HEADERS:
+            response.headers.update(stats.as_headers())
+
+        return response
+
+
+@app.middleware("http")
+async def replica_stickiness(request: Request, call_next):
+    response = await call_next(request)
+
+    if request.method in REPLICA_WRITE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            key=REPLICA_LAST_WRITE_COOKIE,
+            value=str(time.time()),
+            max_age=math.ceil(REPLICA_STICKINESS_SECONDS),
+            httponly=True,
+            secure=True,
+            samesite="none"
+        )
+
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -31,6 +110,15 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 
 scheduler = AsyncIOScheduler()
-scheduler.add_job(crud.delete_expired_tokens, 'interval', hours=12)
-scheduler.add_job(notify_about_birthday, 'interval', seconds=15)
-scheduler.start()
+scheduler.add_job(
+    track_queries("delete_expired_tokens")(crud.delete_expired_tokens),
+    'interval', minutes=TOKEN_PURGE_INTERVAL_MINUTES
+)
+scheduler.add_job(
+    track_queries("sync_revoked_tokens")(revoked_tokens.sync),
+    'interval', seconds=REVOCATION_SYNC_INTERVAL_SECONDS
+)
+scheduler.add_job(
+    track_queries("replica_health_check")(replica_router.check_health),
+    'interval', seconds=REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+)
@@ -6,7 +6,26 @@ from fastapi_mail import ConnectionConfig
 load_dotenv()
 
 PG_CONNECTION_URL = os.getenv('PG_CONNECTION_URL')
+PG_REPLICA_CONNECTION_URL = os.getenv('PG_REPLICA_CONNECTION_URL')
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))
+REPLICA_STICKINESS_SECONDS = float(os.getenv('REPLICA_STICKINESS_SECONDS', 15))
+REPLICA_CONNECT_TIMEOUT_SECONDS = float(os.getenv('REPLICA_CONNECT_TIMEOUT_SECONDS', 2))
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+DB_QUERY_STATS_HEADERS = os.getenv('DB_QUERY_STATS_HEADERS', 'False') == 'True'
+DB_QUERY_CACHE_SIZE = int(os.getenv('DB_QUERY_CACHE_SIZE', 500))
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv('DB_PREPARED_STATEMENT_CACHE_SIZE', 500))
 SECRET_KEY = os.getenv('SECRET_KEY')
+SERVICE_METRICS_TOKEN = os.getenv('SERVICE_METRICS_TOKEN')
+
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', 4))
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv('PASSWORD_HASHING_QUEUE_SIZE', 64))
+
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 4))
+SMTP_POOL_MAX_IDLE_SECONDS = float(os.getenv('SMTP_POOL_MAX_IDLE_SECONDS', 60))
 
 EMAIL_CONFIGURATION = ConnectionConfig(
     MAIL_USERNAME=os.getenv('MAIL_USERNAME'),
@@ -0,0 +1,52 @@
+import os
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
+
+os.environ["PG_CONNECTION_URL"] = os.getenv("PG_TEST_URL", "postgresql+asyncpg://postgres@localhost/testgm")
+os.environ.setdefault("MAIL_SERVER", "127.0.0.1")
+os.environ.setdefault("MAIL_PORT", "8025")
+os.environ.setdefault("MAIL_FROM", "tests@example.com")
+os.environ.setdefault("MAIL_USERNAME", "")
+os.environ.setdefault("MAIL_PASSWORD", "")
+os.environ.setdefault("SECRET_KEY", "tests")
+
+import pytest
+
+from database.query_stats import QueryStats, count_queries
+
+
+requires_postgres = pytest.mark.skipif(
+    not os.getenv("PG_TEST_URL"),
+    reason="PG_TEST_URL не задан: тесты с Postgres пропущены."
+)
+
+
+@pytest.fixture(scope="session")
+def migrated_database() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+
+@pytest.fixture
+async def database(migrated_database) -> None:
+    from database.core import engine
+
+    yield
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., ContextManager[QueryStats]]:
+
+    @contextmanager
+    def budget(statements: int, checkouts: int = 1) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+
+        assert stats.statements <= statements, f"Превышен бюджет запросов ({statements}): {stats}"
+        assert stats.checkouts <= checkouts, f"Превышен бюджет соединений ({checkouts}): {stats}"
+
+    return budget
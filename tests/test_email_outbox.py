@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.constants.notification_constants import (
+    EMAIL_OUTBOX_STATUS_PENDING, EMAIL_OUTBOX_STATUS_SENDING, EMAIL_OUTBOX_STATUS_DEAD,
+    EMAIL_OUTBOX_LEASE_EXPIRED_ERROR
+)
+from app.services import email_outbox as email_outbox_module
+from app.services.email_outbox import EmailOutboxSender
+from database import crud
+from database.core import AsyncSessionManager
+from database.models import EmailOutbox
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+MAX_ATTEMPTS = 3
+
+EXPIRED = datetime(2000, 1, 1)
+
+
+@pytest.fixture
+def sender() -> EmailOutboxSender:
+    return EmailOutboxSender(batch_size=3, max_attempts=MAX_ATTEMPTS, backoff_base=30, backoff_max=3600, lease=600)
+
+
+@pytest.fixture
+def failing_smtp(monkeypatch) -> list[str]:
+    attempted_recipients = []
+
+    async def send_message_to_email(text, subject, recipients: list[str], subtype) -> None:
+        attempted_recipients.extend(recipients)
+        raise ConnectionError("smtp down")
+
+    monkeypatch.setattr(email_outbox_module, "send_message_to_email", send_message_to_email)
+
+    return attempted_recipients
+
+
+async def create_email(status: str, attempts: int) -> int:
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            email = EmailOutbox(
+                recipient=f"{uuid.uuid4().hex[:8]}@example.com",
+                subject="Тест",
+                body="Тест",
+                status=status,
+                attempts=attempts,
+                next_attempt_at=EXPIRED
+            )
+            session.add(email)
+
+    return email.id
+
+
+async def read_email(email_id: int) -> EmailOutbox:
+    async with AsyncSessionManager() as session:
+        return (await session.execute(select(EmailOutbox).where(EmailOutbox.id == email_id))).scalar_one()
+
+
+async def test_claim_counts_attempts_and_dead_letters_exhausted_leases(sender, failing_smtp, database):
+    pending_id = await create_email(status=EMAIL_OUTBOX_STATUS_PENDING, attempts=0)
+    expired_id = await create_email(status=EMAIL_OUTBOX_STATUS_SENDING, attempts=1)
+    exhausted_id = await create_email(status=EMAIL_OUTBOX_STATUS_SENDING, attempts=MAX_ATTEMPTS)
+
+    assert await sender._send_batch() == 3
+
+    pending, expired, exhausted = [await read_email(email_id) for email_id in (pending_id, expired_id, exhausted_id)]
+
+    assert (pending.status, pending.attempts) == (EMAIL_OUTBOX_STATUS_PENDING, 1)
+    assert (expired.status, expired.attempts) == (EMAIL_OUTBOX_STATUS_PENDING, 2)
+    assert (exhausted.status, exhausted.attempts) == (EMAIL_OUTBOX_STATUS_DEAD, MAX_ATTEMPTS)
+    assert exhausted.last_error == EMAIL_OUTBOX_LEASE_EXPIRED_ERROR
+    assert exhausted.recipient not in failing_smtp
+    assert sender.stats()["dead"] == 1
+
+
+async def test_message_that_never_finishes_reaches_dead_letter(database):
+    email_id = await create_email(status=EMAIL_OUTBOX_STATUS_PENDING, attempts=0)
+
+    for _ in range(MAX_ATTEMPTS + 1):
+        async with AsyncSessionManager() as session:
+            async with session.begin():
+                await crud.claim_pending_emails(
+                    session=session,
+                    limit=1,
+                    leased_until=EXPIRED,
+                    max_attempts=MAX_ATTEMPTS
+                )
+
+    email = await read_email(email_id)
+
+    assert email.status == EMAIL_OUTBOX_STATUS_DEAD
+    assert email.attempts == MAX_ATTEMPTS
@@ -0,0 +1,76 @@
+import uuid
+from datetime import date
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.security import create_access_token
+from database import crud
+from database.core import AsyncSessionManager
+from database.models import Notification, Subscribe
+from main import app
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+
+@pytest.fixture
+async def client(database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+        yield client
+
+
+async def create_user(birthday: date) -> dict:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            user = await crud.create_user(
+                session=session,
+                username=f"follow{suffix}",
+                email=f"follow{suffix}@example.com",
+                hashed_password="x",
+                birthday=birthday
+            )
+
+    return {"id": user.id, "headers": {"Authorization": f"Bearer {await create_access_token(sub=str(user.id))}"}}
+
+
+async def read_notification_time(follower_id: int, followed_id: int):
+    async with AsyncSessionManager() as session:
+        return await session.scalar(
+            select(Notification.notification_time).join(
+                Subscribe, Subscribe.id == Notification.subscription_id
+            ).where(
+                Subscribe.follower_id == follower_id,
+                Subscribe.followed_id == followed_id
+            )
+        )
+
+
+async def test_single_and_bulk_follow_schedule_leap_day_birthdays_alike(client):
+    leap_day_user = await create_user(date(2000, 2, 29))
+    single_follower = await create_user(date(1990, 1, 1))
+    bulk_follower = await create_user(date(1990, 1, 1))
+    body = {"notification_timedelta": "00:30:00"}
+
+    response = await client.post(
+        f"/user/follow-user/{leap_day_user['id']}", headers=single_follower["headers"], json=body
+    )
+    assert response.status_code == 200, response.text
+
+    response = await client.post(
+        "/user/follow-users", headers=bulk_follower["headers"], json={"user_ids": [leap_day_user["id"]], **body}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["results"] == [{"user_id": leap_day_user["id"], "status": "followed"}]
+
+    single_time = await read_notification_time(single_follower["id"], leap_day_user["id"])
+    bulk_time = await read_notification_time(bulk_follower["id"], leap_day_user["id"])
+
+    assert single_time is not None
+    assert single_time == bulk_time
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import notification_scheduler as scheduler_module
+from app.services.notification_scheduler import NotificationScheduler
+from database import crud
+
+
+BASE_TIME = datetime(2030, 1, 1, 12, 0)
+
+
+def notification(notification_id: int, hours: int) -> SimpleNamespace:
+    return SimpleNamespace(id=notification_id, notification_time=BASE_TIME + timedelta(hours=hours))
+
+
+def event(op: str, notification_id: int, hours: int) -> dict:
+    return {
+        "op": op,
+        "id": notification_id,
+        "notification_time": (BASE_TIME + timedelta(hours=hours)).isoformat(),
+    }
+
+
+class FakeSessionManager:
+
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args) -> bool:
+        return False
+
+
+def drain(scheduler: NotificationScheduler) -> list[int]:
+    notification_ids = []
+
+    while scheduler._ids:
+        _, notification_id = scheduler._pop()
+
+        if notification_id not in scheduler._cancelled:
+            notification_ids.append(notification_id)
+
+    return notification_ids
+
+
+@pytest.fixture
+def scheduler(monkeypatch) -> NotificationScheduler:
+    monkeypatch.setattr(scheduler_module, "AsyncSessionManager", FakeSessionManager)
+
+    return NotificationScheduler(window_size=2, low_watermark=1, batch_size=10, retry_delay=1)
+
+
+def serve_pages(monkeypatch, scheduler: NotificationScheduler, pages: list[tuple[list, list[dict]]]) -> None:
+    remaining = list(pages)
+
+    async def read_scheduled_notifications(session, limit, after=None):
+        notifications, concurrent_events = remaining.pop(0)
+        await asyncio.sleep(0)
+
+        for concurrent_event in concurrent_events:
+            scheduler.handle_event(concurrent_event)
+
+        return notifications
+
+    monkeypatch.setattr(crud, "read_scheduled_notifications", read_scheduled_notifications)
+
+
+async def test_event_between_old_and_new_cursor_during_refill_is_kept(monkeypatch, scheduler):
+    serve_pages(monkeypatch, scheduler, [
+        ([notification(1, 1), notification(2, 2)], []),
+        ([notification(3, 3), notification(4, 5)], [event("INSERT", 5, 4)]),
+    ])
+
+    await scheduler.resync()
+    await scheduler.refill()
+
+    assert scheduler._cursor == (BASE_TIME + timedelta(hours=5), 4)
+    assert drain(scheduler) == [1, 2, 3, 5, 4]
+
+
+async def test_events_during_refill_are_replayed_against_the_new_window(monkeypatch, scheduler):
+    serve_pages(monkeypatch, scheduler, [
+        ([notification(1, 1), notification(2, 2)], []),
+        (
+            [notification(3, 3), notification(4, 5)],
+            [event("DELETE", 3, 3), event("UPDATE", 6, 6), event("UPDATE", 2, 4)],
+        ),
+    ])
+
+    await scheduler.resync()
+    await scheduler.refill()
+
+    assert scheduler.stats()["deferred_events"] == 0
+    assert drain(scheduler) == [1, 2, 2, 4]
+
+
+async def test_deferred_events_are_replayed_when_refill_fails(monkeypatch, scheduler):
+    serve_pages(monkeypatch, scheduler, [
+        ([notification(1, 1), notification(2, 2)], []),
+    ])
+
+    await scheduler.resync()
+
+    async def failing_read(session, limit, after=None):
+        scheduler.handle_event(event("INSERT", 7, 0))
+        raise ConnectionError()
+
+    monkeypatch.setattr(crud, "read_scheduled_notifications", failing_read)
+
+    with pytest.raises(ConnectionError):
+        await scheduler.refill()
+
+    assert drain(scheduler) == [7, 1, 2]
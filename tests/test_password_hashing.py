@@ -0,0 +1,151 @@
+import asyncio
+import time
+import uuid
+from datetime import date
+
+import httpx
+import pytest
+
+from app.api.v1 import user_router
+from app.core import security
+from app.core.cache import principal_cache
+from app.core.hashing import BoundedPasswordHasher
+from app.core.security import create_access_token, pwd_context
+from app.exceptions.service_exceptions import ServiceOverloaded
+from database import crud
+from database.core import AsyncSessionManager
+from main import app
+from tests.conftest import requires_postgres
+
+
+HASH_SECONDS = 0.2
+
+LOGIN_STORM_SIZE = 8
+
+
+def slow_hash(password: str) -> str:
+    time.sleep(HASH_SECONDS)
+
+    return password[::-1]
+
+
+def slow_verify(plain_password: str, hashed_password: str) -> bool:
+    time.sleep(HASH_SECONDS)
+
+    return True
+
+
+@pytest.fixture
+def slow_password_verification(monkeypatch) -> None:
+    monkeypatch.setattr(pwd_context, "verify", slow_verify)
+    monkeypatch.setattr(user_router.login_rate_limiter, "limits", {})
+
+
+@pytest.fixture
+async def client(database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def account(database) -> dict:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            user = await crud.create_user(
+                session=session,
+                username=f"storm{suffix}",
+                email=f"storm{suffix}@example.com",
+                hashed_password="x",
+                birthday=date(1990, 1, 1)
+            )
+
+    return {
+        "username": user.username,
+        "headers": {"Authorization": f"Bearer {await create_access_token(sub=str(user.id))}"},
+    }
+
+
+async def login(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    return await client.post("/user/login", data={"username": username, "password": "password"})
+
+
+async def measure_me(
+        client: httpx.AsyncClient,
+        headers: dict,
+        until: asyncio.Future | None = None,
+        samples: int = 20,
+        interval: float = 0.01
+) -> list[float]:
+    latencies = []
+
+    while len(latencies) < samples or (until is not None and not until.done()):
+        due_at = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+
+        principal_cache.clear()
+        response = await client.get("/user/me", headers=headers)
+        latencies.append(time.perf_counter() - due_at)
+
+        assert response.status_code == 200
+
+    return latencies
+
+
+@requires_postgres
+async def test_me_latency_stays_flat_during_login_storm(client, account, slow_password_verification):
+    await asyncio.gather(*(login(client, account["username"]) for _ in range(LOGIN_STORM_SIZE)))
+    completed = security.password_hasher.stats()["completed"]
+
+    baseline = await measure_me(client, account["headers"])
+
+    logins = asyncio.gather(*(login(client, account["username"]) for _ in range(LOGIN_STORM_SIZE)))
+    under_load = await measure_me(client, account["headers"], until=logins)
+    responses = await logins
+
+    assert all(response.status_code == 200 for response in responses)
+    assert max(under_load) < HASH_SECONDS
+    assert sorted(under_load)[len(under_load) // 2] < max(baseline) + HASH_SECONDS / 10
+    assert security.password_hasher.stats()["completed"] - completed == LOGIN_STORM_SIZE
+
+
+async def test_hasher_rejects_when_queue_is_full():
+    hasher = BoundedPasswordHasher(max_workers=1, max_queue_size=1)
+
+    try:
+        accepted = [asyncio.create_task(hasher.run(slow_hash, "password")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert hasher.stats()["in_flight"] == 2
+
+        with pytest.raises(ServiceOverloaded) as error:
+            await hasher.run(slow_hash, "password")
+
+        await asyncio.gather(*accepted)
+    finally:
+        hasher.shutdown()
+
+    assert error.value.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["completed"] == 2
+
+
+@requires_postgres
+async def test_login_returns_503_with_retry_after_when_overloaded(
+        monkeypatch, client, account, slow_password_verification
+):
+    hasher = BoundedPasswordHasher(max_workers=1, max_queue_size=2)
+    monkeypatch.setattr(security, "password_hasher", hasher)
+
+    try:
+        responses = await asyncio.gather(*(login(client, account["username"]) for _ in range(6)))
+    finally:
+        hasher.shutdown()
+
+    statuses = sorted(response.status_code for response in responses)
+
+    assert statuses == [200, 200, 200, 503, 503, 503]
+    assert all(response.headers["Retry-After"] for response in responses if response.status_code == 503)
@@ -0,0 +1,145 @@
+import uuid
+from datetime import date
+from functools import partial
+
+import httpx
+import pytest
+from email_validator import validate_email
+
+from app.api.v1 import user_router
+from app.core.cache import principal_cache
+from app.core.security import create_access_token, pwd_context
+from database import crud
+from database.core import AsyncSessionManager
+from main import app
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+PASSWORD = "password"
+HASHED_PASSWORD = pwd_context.hash(PASSWORD)
+
+
+@pytest.fixture(autouse=True)
+def offline_email_validation(monkeypatch) -> None:
+    monkeypatch.setattr(user_router, "validate_email", partial(validate_email, check_deliverability=False))
+
+
+@pytest.fixture
+async def client(database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def accounts(database) -> list[dict]:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            users = [
+                await crud.create_user(
+                    session=session,
+                    username=f"budget{index}{suffix}",
+                    email=f"budget{index}{suffix}@example.com",
+                    hashed_password=HASHED_PASSWORD,
+                    birthday=date(1990, index + 1, 15)
+                )
+                for index in range(3)
+            ]
+
+    return [
+        {
+            "id": user.id,
+            "username": user.username,
+            "headers": {"Authorization": f"Bearer {await create_access_token(sub=str(user.id))}"},
+        }
+        for user in users
+    ]
+
+
+@pytest.fixture
+async def following(client, accounts) -> list[dict]:
+    response = await client.post(
+        "/user/follow-users",
+        headers=accounts[0]["headers"],
+        json={"user_ids": [accounts[1]["id"], accounts[2]["id"]], "notification_timedelta": "00:30:00"}
+    )
+    assert response.status_code == 200
+
+    return accounts
+
+
+async def request(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    principal_cache.clear()
+    response = await client.request(method, url, **kwargs)
+
+    assert response.status_code == 200, response.text
+
+    return response
+
+
+async def test_register_budget(client, query_budget):
+    suffix = uuid.uuid4().hex[:8]
+
+    with query_budget(statements=1):
+        await request(client, "POST", "/user/register", data={
+            "username": f"register{suffix}",
+            "email": f"register{suffix}@example.com",
+            "password": PASSWORD,
+            "password_confirmation": PASSWORD,
+            "birthday": "1990-01-01",
+        })
+
+
+async def test_login_budget(client, accounts, query_budget):
+    with query_budget(statements=1):
+        await request(client, "POST", "/user/login", data={"username": accounts[0]["username"], "password": PASSWORD})
+
+
+async def test_logout_budget(client, accounts, query_budget):
+    with query_budget(statements=1):
+        await request(client, "DELETE", "/user/logout", headers=accounts[0]["headers"])
+
+
+async def test_me_budget(client, following, query_budget):
+    with query_budget(statements=3):
+        await request(client, "GET", "/user/me", headers=following[0]["headers"])
+
+
+@pytest.mark.parametrize("url", [
+    "/user/list-of-users",
+    "/user/followers",
+    "/user/following",
+    "/user/list-of-notifications",
+    "/user/upcoming-birthdays?days=366",
+])
+async def test_read_budget(client, following, query_budget, url):
+    with query_budget(statements=2):
+        await request(client, "GET", url, headers=following[0]["headers"])
+
+
+async def test_follow_user_budget(client, accounts, query_budget):
+    with query_budget(statements=5):
+        await request(
+            client, "POST", f"/user/follow-user/{accounts[1]['id']}",
+            headers=accounts[0]["headers"],
+            json={"notification_timedelta": "00:30:00"}
+        )
+
+
+async def test_follow_users_budget(client, accounts, query_budget):
+    with query_budget(statements=4):
+        await request(
+            client, "POST", "/user/follow-users",
+            headers=accounts[0]["headers"],
+            json={"user_ids": [accounts[1]["id"], accounts[2]["id"]], "notification_timedelta": "00:30:00"}
+        )
+
+
+async def test_unfollow_user_budget(client, following, query_budget):
+    with query_budget(statements=3):
+        await request(client, "DELETE", f"/user/unfollow-user/{following[1]['id']}", headers=following[0]["headers"])
@@ -0,0 +1,229 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterator
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database import crud
+from database.core import AsyncSessionManager, engine
+from settings.loader import PG_CONNECTION_URL
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+SEED_USERS = 20_000
+SEED_FOLLOWING_PER_USER = 5
+SEED_TOKENS = 20_000
+
+HOT_TABLES = {"notification", "subscribe", "user", "token_blacklist_outstanding"}
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO "user" (username, email, hashed_password, birthday)
+    SELECT 'plan' || g, 'plan' || g || '@example.com', 'x', DATE '1970-01-01' + (g * 7919) % 18250
+    FROM generate_series(1, :users) AS g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    WITH seeded AS (
+        SELECT id, row_number() OVER (ORDER BY id) AS position
+        FROM "user"
+        WHERE username LIKE 'plan%'
+    )
+    INSERT INTO subscribe (follower_id, followed_id)
+    SELECT follower.id, followed.id
+    FROM seeded AS follower
+    CROSS JOIN generate_series(1, :following) AS step
+    JOIN seeded AS followed ON followed.position = (follower.position + step * 37) % :users + 1
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO notification (subscription_id, notification_time)
+    SELECT subscribe.id, date_trunc('hour', now()) + (subscribe.id % 8760) * INTERVAL '1 hour'
+    FROM subscribe
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO token_blacklist_outstanding (exp, iat, jti, user_id)
+    SELECT
+        extract(epoch FROM now())::integer + CASE WHEN g % 50 = 0 THEN -3600 ELSE 86400 * (g % 30 + 1) END,
+        extract(epoch FROM now())::integer - 3600,
+        'plan-' || g,
+        (SELECT min(id) FROM "user" WHERE username LIKE 'plan%') + g % :users
+    FROM generate_series(1, :tokens) AS g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO token_blacklisted (token_id, blacklisted_at)
+    SELECT id, now() - (id % 10000) * INTERVAL '1 minute'
+    FROM token_blacklist_outstanding
+    WHERE jti LIKE 'plan-%' AND id % 10 = 0
+    """,
+]
+
+
+async def _seed() -> None:
+    seed_engine = create_async_engine(PG_CONNECTION_URL)
+
+    try:
+        async with seed_engine.begin() as connection:
+            seeded = await connection.scalar(text("SELECT count(*) FROM \"user\" WHERE username LIKE 'plan%'"))
+
+            if seeded < SEED_USERS:
+                for statement in SEED_STATEMENTS:
+                    await connection.execute(
+                        text(statement),
+                        {"users": SEED_USERS, "following": SEED_FOLLOWING_PER_USER, "tokens": SEED_TOKENS}
+                    )
+
+        async with seed_engine.connect() as connection:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(text("ANALYZE"))
+    finally:
+        await seed_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded_database(migrated_database) -> None:
+    asyncio.run(_seed())
+
+
+@pytest.fixture
+async def plan_context(seeded_database, database) -> dict:
+    async with AsyncSessionManager() as session:
+        user_ids = (await session.execute(text(
+            "SELECT id FROM \"user\" WHERE username LIKE 'plan%' ORDER BY id LIMIT 3 OFFSET 100"
+        ))).scalars().all()
+        followed_id = await session.scalar(text(
+            "SELECT followed_id FROM subscribe WHERE follower_id = :user_id LIMIT 1"
+        ), {"user_id": user_ids[0]})
+
+    return {"user_id": user_ids[0], "other_ids": user_ids[1:], "followed_id": followed_id}
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[tuple[str, tuple]]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    seq_scans = []
+
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        seq_scans.append(plan["Relation Name"])
+
+    for child in plan.get("Plans", []):
+        seq_scans.extend(find_seq_scans(child))
+
+    return seq_scans
+
+
+async def assert_no_seq_scans(call: Callable[[AsyncSession], Awaitable]) -> None:
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            with capture_statements() as statements:
+                await call(session)
+
+            await session.rollback()
+
+    assert statements
+
+    async with engine.connect() as connection:
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+
+            seq_scans = find_seq_scans(plan[0]["Plan"])
+
+            assert not seq_scans, (
+                f"Seq Scan по {', '.join(seq_scans)}:\n{statement}\n"
+                f"{json.dumps(plan[0]['Plan'], ensure_ascii=False, indent=2)}"
+            )
+
+
+HOT_QUERIES = {
+    "read_user_by_user_id": lambda session, ctx: crud.read_user_by_user_id(
+        session=session, user_id=ctx["user_id"]
+    ),
+    "read_user_base_by_user_id": lambda session, ctx: crud.read_user_base_by_user_id(
+        session=session, user_id=ctx["user_id"]
+    ),
+    "read_user_by_username": lambda session, ctx: crud.read_user_by_username(
+        session=session, username="plan100"
+    ),
+    "read_list_of_users": lambda session, ctx: crud.read_list_of_users(
+        session=session, limit=50, after_id=ctx["user_id"]
+    ),
+    "read_list_of_followers": lambda session, ctx: crud.read_list_of_followers(
+        session=session, user_id=ctx["followed_id"], limit=50, after_id=None
+    ),
+    "read_list_of_following": lambda session, ctx: crud.read_list_of_following(
+        session=session, user_id=ctx["user_id"], limit=50, after_id=None
+    ),
+    "read_user_list_of_notifications": lambda session, ctx: crud.read_user_list_of_notifications(
+        session=session, user_id=ctx["user_id"], limit=50
+    ),
+    "read_upcoming_birthdays_following": lambda session, ctx: crud.read_upcoming_birthdays(
+        session=session, user_id=ctx["user_id"], days=7, only_following=True, limit=50
+    ),
+    "read_upcoming_birthdays_all": lambda session, ctx: crud.read_upcoming_birthdays(
+        session=session, user_id=ctx["user_id"], days=7, only_following=False, limit=50
+    ),
+    "read_scheduled_notifications": lambda session, ctx: crud.read_scheduled_notifications(
+        session=session, limit=1_000, after=(datetime.now() + timedelta(days=30), 0)
+    ),
+    "enqueue_due_birthday_emails": lambda session, ctx: crud.enqueue_due_birthday_emails(
+        session=session, limit=100
+    ),
+    "read_revoked_tokens": lambda session, ctx: crud.read_revoked_tokens(
+        session=session, since=datetime.now() - timedelta(minutes=5)
+    ),
+    "create_bulk_follow_users": lambda session, ctx: crud.create_bulk_follow_users(
+        session=session,
+        current_user_id=ctx["user_id"],
+        following_user_ids=ctx["other_ids"],
+        notification_timedelta=timedelta()
+    ),
+    "delete_follow_user": lambda session, ctx: crud.delete_follow_user(
+        session=session, current_user_id=ctx["user_id"], following_user_id=ctx["followed_id"]
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+async def test_hot_query_uses_indexes(plan_context, name):
+    await assert_no_seq_scans(lambda session: HOT_QUERIES[name](session, plan_context))
+
+
+async def test_expired_token_purge_uses_exp_index(plan_context):
+    with capture_statements() as statements:
+        await crud.delete_expired_tokens(batch_size=100, pause=0)
+
+    purge_statements = [statement for statement in statements if statement[0].startswith("DELETE")]
+
+    assert purge_statements
+
+    async with engine.connect() as connection:
+        for statement, parameters in purge_statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+
+            assert not find_seq_scans(plan[0]["Plan"]), statement
@@ -0,0 +1,82 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import security
+from app.core.cache import principal_cache
+from database import crud
+from database import replica as replica_module
+from database.replica import ReplicaRouter
+
+
+REPLICA_ENGINE = object()
+
+
+@pytest.fixture
+def router(monkeypatch) -> ReplicaRouter:
+    monkeypatch.setattr(replica_module, "ReplicaSessionManager", object())
+    monkeypatch.setattr(replica_module, "replica_engine", REPLICA_ENGINE)
+
+    router = ReplicaRouter(max_lag=5, stickiness=15)
+    router.healthy = True
+
+    return router
+
+
+def test_reads_without_recent_write_go_to_replica(router):
+    assert router.use_replica(None)
+    assert router.use_replica(str(time.time() - 60))
+    assert router.replica_reads == 2
+
+
+def test_recent_write_sticks_reads_to_primary(router):
+    assert not router.use_replica(str(time.time() - 1))
+    assert router.sticky_reads == 1
+
+
+@pytest.mark.parametrize("last_write_at", ["garbage", "nan", "inf", str(time.time() + 3600)])
+def test_malformed_or_future_write_time_is_ignored(router, last_write_at):
+    assert router.use_replica(last_write_at)
+
+
+async def test_unreachable_replica_falls_back_to_primary(monkeypatch, router):
+    unreachable_engine = create_async_engine(
+        "postgresql+asyncpg://postgres@127.0.0.1:1/postgres",
+        connect_args={"timeout": 1}
+    )
+    monkeypatch.setattr(security, "replica_router", router)
+    monkeypatch.setattr(security, "ReplicaSessionManager", async_sessionmaker(unreachable_engine, class_=AsyncSession))
+    primary_session = object()
+
+    read_session = security.get_read_session(session=primary_session, last_write_at=None)
+
+    try:
+        assert await anext(read_session) is primary_session
+    finally:
+        await read_session.aclose()
+        await unreachable_engine.dispose()
+
+    assert not router.healthy
+    assert router.fallback_reads == 1
+    assert not router.use_replica(None)
+
+
+async def test_replica_reads_do_not_populate_principal_cache(monkeypatch, router):
+    monkeypatch.setattr(security, "replica_router", router)
+    user = SimpleNamespace(id=42)
+
+    async def read_user_by_user_id(session, user_id):
+        return user
+
+    monkeypatch.setattr(crud, "read_user_by_user_id", read_user_by_user_id)
+    principal_cache.clear()
+
+    assert await security.get_current_user(user_id=42, session=SimpleNamespace(bind=REPLICA_ENGINE)) is user
+    assert principal_cache.get(42) is None
+
+    assert await security.get_current_user(user_id=42, session=SimpleNamespace(bind=object())) is user
+    assert principal_cache.get(42) is user
+
+    principal_cache.clear()
@@ -0,0 +1,67 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from database import crud
+from database.core import AsyncSessionManager
+from database.models import TokenBlacklistOutstanding
+from database.token_ledger import RefreshTokenLedger
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+
+@pytest.fixture
+async def user_id(database) -> int:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            user = await crud.create_user(
+                session=session,
+                username=f"ledger{suffix}",
+                email=f"ledger{suffix}@example.com",
+                hashed_password="x",
+                birthday=date(1990, 1, 1)
+            )
+
+    return user.id
+
+
+@pytest.fixture
+def ledger() -> RefreshTokenLedger:
+    return RefreshTokenLedger(flush_interval=60, batch_size=10, shutdown_retries=1, max_buffer_size=3)
+
+
+async def read_jtis(jtis: list[str]) -> set[str]:
+    async with AsyncSessionManager() as session:
+        result = await session.execute(
+            select(TokenBlacklistOutstanding.jti).where(TokenBlacklistOutstanding.jti.in_(jtis))
+        )
+
+    return set(result.scalars().all())
+
+
+async def test_bad_row_does_not_block_the_batch(ledger, user_id):
+    jtis = [uuid.uuid4().hex for _ in range(3)]
+
+    ledger.add(exp=2_000_000_000, iat=1_000_000_000, jti=jtis[0], user_id=user_id)
+    ledger.add(exp=2_000_000_000, iat=1_000_000_000, jti=jtis[1], user_id=-1)
+    ledger.add(exp=2_000_000_000, iat=1_000_000_000, jti=jtis[2], user_id=user_id)
+
+    await ledger.flush()
+
+    assert await read_jtis(jtis) == {jtis[0], jtis[2]}
+    assert ledger.stats()["buffered"] == 0
+    assert ledger.stats()["rejected_rows"] == 1
+
+
+async def test_buffer_is_capped(ledger, user_id):
+    for _ in range(5):
+        ledger.add(exp=2_000_000_000, iat=1_000_000_000, jti=uuid.uuid4().hex, user_id=user_id)
+
+    assert ledger.stats()["buffered"] == 3
+    assert ledger.stats()["dropped_rows"] == 2
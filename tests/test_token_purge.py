@@ -0,0 +1,26 @@
+import logging
+
+from database import crud
+
+
+class FailingSessionManager:
+
+    async def __aenter__(self):
+        raise ConnectionError("database is down")
+
+    async def __aexit__(self, *args) -> bool:
+        return False
+
+
+async def test_failed_purge_is_logged_as_error_without_completion_summary(monkeypatch, caplog):
+    monkeypatch.setattr(crud, "AsyncSessionManager", FailingSessionManager)
+
+    with caplog.at_level(logging.INFO):
+        deleted = await crud.delete_expired_tokens(batch_size=10, pause=0)
+
+    errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+
+    assert deleted == 0
+    assert len(errors) == 1
+    assert errors[0].exc_info[0] is ConnectionError
+    assert not any("завершена" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+from datetime import date
+
+import httpx
+import pytest
+from jose import jwt
+
+from app.core.revocation import revoked_tokens
+from app.core.security import create_refresh_token
+from database import crud
+from database.core import AsyncSessionManager
+from main import app
+from settings.loader import SECRET_KEY
+from app.constants.token_constants import ALGORITHM
+from tests.conftest import requires_postgres
+
+
+pytestmark = requires_postgres
+
+
+@pytest.fixture
+async def client(database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def refresh_token(database) -> str:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionManager() as session:
+        async with session.begin():
+            user = await crud.create_user(
+                session=session,
+                username=f"revoke{suffix}",
+                email=f"revoke{suffix}@example.com",
+                hashed_password="x",
+                birthday=date(1990, 1, 1)
+            )
+            token = await create_refresh_token(session=session, sub=str(user.id))
+
+    return token
+
+
+async def refresh(client: httpx.AsyncClient, token: str) -> httpx.Response:
+    return await client.post("/token/refresh", headers={"Cookie": f"refresh_token={token}"})
+
+
+async def test_replayed_refresh_token_is_rejected_before_revocation_sync(client, refresh_token):
+    jti = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])["jti"]
+
+    assert (await refresh(client, refresh_token)).status_code == 200
+    assert revoked_tokens.is_revoked(jti)
+
+    revoked_tokens._revoked.pop(jti)
+
+    assert (await refresh(client, refresh_token)).status_code == 401
+
+
+async def test_concurrent_rotation_of_one_refresh_token_succeeds_once(client, refresh_token):
+    responses = await asyncio.gather(*(refresh(client, refresh_token) for _ in range(2)))
+
+    assert sorted(response.status_code for response in responses) == [200, 401]